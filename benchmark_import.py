@@ -0,0 +1,83 @@
+"""
+插件导入耗时基准测试
+
+在新进程中导入 `nonebot_plugin_nerdle_autoplay/data_source.py`，
+测量导入耗时，并检查 selenium、Pillow 等较重的依赖是否被推迟到首次使用时才导入。
+插件的 __init__.py 需要运行中的 NoneBot，这里跳过它，直接以包的形式加载插件目录下的模块。
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+PACKAGE = "nonebot_plugin_nerdle_autoplay"
+
+# 应当推迟到首次使用时才导入的模块
+LAZY_MODULES = ["PIL.Image", "PIL.ImageDraw", "PIL.ImageFont", "selenium", "selenium.webdriver"]
+
+PROBE = """
+import importlib, importlib.util, json, os, sys, time
+root, package, module, lazy = sys.argv[1], sys.argv[2], sys.argv[3], json.loads(sys.argv[4])
+
+# 跳过插件的 __init__.py（需要运行中的 NoneBot）
+spec = importlib.util.spec_from_file_location(
+    package, os.path.join(root, package, "__init__.py"), submodule_search_locations=[os.path.join(root, package)]
+)
+sys.modules[package] = importlib.util.module_from_spec(spec)
+
+start = time.perf_counter()
+importlib.import_module(package + "." + module)
+result = {"import": time.perf_counter() - start, "eager": [name for name in lazy if name in sys.modules], "deferred": {}}
+
+for name in lazy:
+    start = time.perf_counter()
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        result["deferred"][name] = None
+        continue
+    result["deferred"][name] = time.perf_counter() - start
+print(json.dumps(result))
+"""
+
+
+def measure(module: str) -> dict:
+    """在新进程中测量一次导入"""
+    output = subprocess.check_output(
+        [sys.executable, "-c", PROBE, ROOT_DIR, PACKAGE, module, json.dumps(LAZY_MODULES)], text=True
+    )
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="插件导入耗时基准测试")
+    parser.add_argument("--module", default="data_source", help="要导入的插件模块")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取最快一次）")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.repeat)]
+    best = min(runs, key=lambda run: run["import"])
+    print(f"import {PACKAGE}.{args.module}  {best['import'] * 1000:10.2f} ms")
+
+    if best["eager"]:
+        print(f"✗ 以下模块在导入时就被加载: {', '.join(best['eager'])}")
+    else:
+        print("✓ 较重的依赖均推迟到首次使用时导入")
+
+    print("首次使用时的额外导入耗时:")
+    width = max(len(name) for name in LAZY_MODULES)
+    for name in LAZY_MODULES:
+        seconds = best["deferred"][name]
+        if name in best["eager"]:
+            print(f"  {name.ljust(width)}  {'已在导入时加载':>13}")
+        elif seconds is None:
+            print(f"  {name.ljust(width)}  {'未安装':>13}")
+        else:
+            print(f"  {name.ljust(width)}  {seconds * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
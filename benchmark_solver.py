@@ -0,0 +1,112 @@
+"""
+Nerdle 求解引擎基准测试
+
+对 `nonebot_plugin_nerdle_autoplay/solver.py` 中的求解函数计时，
+插件与 click_nerdle.py 共用同一实现，在这里测得的结果对两者都成立。
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+from plugin_loader import register_plugin_package
+
+register_plugin_package()
+
+from nonebot_plugin_nerdle_autoplay.solver import (  # noqa: E402
+    CandidateSet,
+    ConstraintIndex,
+    best_probe_guess,
+    feedback_pattern,
+    filter_candidates_by_feedback,
+    load_dictionary,
+    nerdle_feedback,
+    suggest_next_guess,
+)
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def timeit(func, repeat: int) -> float:
+    """多次运行取最快一次的耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def import_time() -> float:
+    """在新进程中测量导入求解引擎的耗时"""
+    code = (
+        "import sys, time; sys.path.insert(0, sys.argv[1]); "
+        "from plugin_loader import register_plugin_package; register_plugin_package(); "
+        "start = time.perf_counter(); import nonebot_plugin_nerdle_autoplay.solver; "
+        "print(time.perf_counter() - start)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code, ROOT_DIR], text=True)
+    return float(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nerdle 求解引擎基准测试")
+    parser.add_argument("--length", type=int, default=8, help="等式长度（6/7/8）")
+    parser.add_argument("--candidates", type=int, default=200, help="suggest_next_guess 使用的候选数量")
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数（取最快一次）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    entries, metadata = load_dictionary(args.length)
+    equations = [eq for eq in entries if isinstance(eq, str) and len(eq) == args.length]
+    print(f"✓ 从文件读取了 {len(equations)} 个合法等式")
+
+    rng = random.Random(args.seed)
+    answer, guess = rng.sample(equations, 2)
+    real_feedback = nerdle_feedback(answer, guess)
+    sample = rng.sample(equations, min(args.candidates, len(equations)))
+
+    results = [("import solver", import_time())]
+    results.append(("load_dictionary", timeit(lambda: load_dictionary(args.length), args.repeat)))
+    results.append(("ConstraintIndex 构建", timeit(lambda: ConstraintIndex(equations, metadata), 1)))
+    index = ConstraintIndex(equations, metadata)
+    full = CandidateSet(index)
+    remaining = full.narrow(guess, real_feedback)
+
+    results += [
+        (
+            f"nerdle_feedback x{len(equations)}",
+            timeit(lambda: [nerdle_feedback(eq, guess) for eq in equations], args.repeat),
+        ),
+        (
+            f"feedback_pattern x{len(equations)}",
+            timeit(lambda: [feedback_pattern(eq, guess) for eq in equations], args.repeat),
+        ),
+        (
+            "filter_candidates_by_feedback（全词典）",
+            timeit(lambda: filter_candidates_by_feedback(equations, guess, real_feedback), args.repeat),
+        ),
+        (
+            "CandidateSet.narrow（全词典）",
+            timeit(lambda: full.narrow(guess, real_feedback), args.repeat),
+        ),
+        (
+            f"suggest_next_guess（{len(sample)} 个候选）",
+            timeit(lambda: suggest_next_guess(sample), 1),
+        ),
+        (
+            f"best_probe_guess（{len(remaining)} 个候选）",
+            timeit(lambda: best_probe_guess(remaining), 1),
+        ),
+    ]
+
+    width = max(len(name) for name, _ in results)
+    for name, seconds in results:
+        print(f"{name.ljust(width)}  {seconds * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+生成并校验 Nerdle 词典
+
+按 Nerdle 规则枚举指定长度的全部合法等式，与
+`nonebot_plugin_nerdle_autoplay/resources/equals/dic-<长度>.json` 逐条比对，
+一致时写入预先计算的词典元数据 `meta-<长度>.json`（字符频率、各位置字符分布、内容哈希），
+插件加载词典时直接读取这些元数据，不再逐条校验与重复计算。
+
+规则：
+- 左边由不含前导零、不为单独 0 的非负整数与 `+ - * /` 组成，至少含一个运算符；
+- 先乘除后加减，除法必须整除；
+- 右边为计算结果（可以为 0 或负数）。
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, Iterator, List, Tuple
+
+from plugin_loader import register_plugin_package
+
+register_plugin_package()
+
+from nonebot_plugin_nerdle_autoplay.solver import (  # noqa: E402
+    dictionary_file,
+    dictionary_metadata,
+    metadata_file,
+    save_dictionary_metadata,
+)
+
+OPERATORS = "+-*/"
+
+# 词典文件中等式的排列顺序
+CHAR_ORDER = {char: rank for rank, char in enumerate("=0123456789+-*/")}
+
+
+def sort_key(equation: str) -> List[int]:
+    return [CHAR_ORDER[char] for char in equation]
+
+
+def numbers(max_length: int) -> Dict[int, List[Tuple[str, int]]]:
+    """按长度列出可出现在左边的数（无前导零，不为单独 0）"""
+    return {
+        length: [(str(value), value) for value in range(10 ** (length - 1), 10 ** length)]
+        for length in range(1, max_length + 1)
+    }
+
+
+def expressions(max_length: int) -> Iterator[Tuple[str, int]]:
+    """枚举长度不超过 max_length、至少含一个运算符的左边表达式及其值
+
+    递归时记录已完成各项之和与当前乘除项，除法不整除时立即剪枝。
+    """
+    table = numbers(max_length - 2)
+
+    def extend(prefix: str, total: int, sign: int, term: int, op: str) -> Iterator[Tuple[str, int]]:
+        remaining = max_length - len(prefix)
+        for length in range(1, remaining + 1):
+            for text, value in table.get(length, ()):
+                if op == "*":
+                    current = term * value
+                elif op == "/":
+                    if term % value:
+                        continue
+                    current = term // value
+                else:
+                    current = value
+                expr = prefix + text
+                if op:
+                    yield expr, total + sign * current
+                if len(expr) + 2 > max_length:
+                    continue
+                for next_op in OPERATORS:
+                    if next_op in "+-":
+                        yield from extend(
+                            expr + next_op, total + sign * current, 1 if next_op == "+" else -1, 0, next_op
+                        )
+                    else:
+                        yield from extend(expr + next_op, total, sign, current, next_op)
+
+    # 首个数前没有运算符
+    yield from extend("", 0, 1, 0, "")
+
+
+def generate_equations(length: int) -> List[str]:
+    """枚举长度为 length 的全部合法等式，按词典文件的顺序排列"""
+    equations = []
+    for lhs, value in expressions(length - 2):
+        equation = f"{lhs}={value}"
+        if len(equation) == length:
+            equations.append(equation)
+    equations.sort(key=sort_key)
+    return equations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成并校验 Nerdle 词典")
+    parser.add_argument("--length", type=int, nargs="+", default=[6, 7, 8], help="等式长度（6/7/8）")
+    parser.add_argument("--write", action="store_true", help="用生成结果覆盖词典文件（词典不一致时）")
+    args = parser.parse_args()
+
+    ok = True
+    for length in args.length:
+        start = time.perf_counter()
+        generated = generate_equations(length)
+        print(f"✓ 长度 {length}: 生成 {len(generated)} 个合法等式，用时 {time.perf_counter() - start:.1f} 秒")
+
+        path = dictionary_file(length)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            shipped = json.loads(raw)
+        except (OSError, ValueError):
+            raw, shipped = b"", []
+
+        if shipped != generated:
+            generated_set, shipped_set = set(generated), set(shipped)
+            missing = [eq for eq in generated if eq not in shipped_set]
+            extra = [eq for eq in shipped if eq not in generated_set]
+            print(f"✗ {path.name} 与生成结果不一致: 缺少 {len(missing)} 个，多出 {len(extra)} 个")
+            for eq in missing[:5]:
+                print(f"  缺少: {eq}")
+            for eq in extra[:5]:
+                print(f"  多出: {eq}")
+            if not missing and not extra:
+                print("  （仅顺序不同）")
+            if not args.write:
+                ok = False
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 与原有词典文件格式一致（制表符缩进、CRLF 换行）
+            text = json.dumps(generated, ensure_ascii=False, indent="\t") + "\n"
+            raw = text.replace("\n", "\r\n").encode("utf-8")
+            with open(path, "wb") as f:
+                f.write(raw)
+            print(f"✓ 已重新写入 {path.name}，请运行 build_nerdle_tree.py 重新生成决策树")
+
+        save_dictionary_metadata(dictionary_metadata(generated, raw), metadata_file(length))
+        print(f"✓ 已写入 {metadata_file(length).name}")
+
+    if not ok:
+        print("词典校验未通过，可加 --write 用生成结果覆盖")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+离线构建 Nerdle 决策树
+
+遍历词典为每一种反馈预先选好下一次猜测，结果保存到
+`nonebot_plugin_nerdle_autoplay/resources/tree/tree-<长度>.json`，
+插件运行时只需沿树查找，不再需要实时计算。
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from plugin_loader import register_plugin_package
+
+register_plugin_package()
+
+from nonebot_plugin_nerdle_autoplay.solver import (  # noqa: E402
+    build_decision_tree,
+    load_dictionary,
+    save_decision_tree,
+    tree_file,
+)
+
+FIRST_GUESSES = {8: "1+56/7=9"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="构建 Nerdle 决策树")
+    parser.add_argument("--length", type=int, default=8, help="等式长度（6/7/8）")
+    parser.add_argument("--first-guess", default=None, help="固定的首次猜测，默认自动选择")
+    parser.add_argument("--max-turns", type=int, default=6, help="允许的最大尝试次数")
+    parser.add_argument("--alternatives", type=int, default=8, help="超出上限时每个节点尝试的其他猜测数")
+    args = parser.parse_args()
+
+    entries, _ = load_dictionary(args.length)
+    equations = [eq for eq in entries if isinstance(eq, str) and len(eq) == args.length]
+    print(f"✓ 从文件读取了 {len(equations)} 个合法等式")
+
+    max_turns = args.max_turns
+    first_guess = args.first_guess or FIRST_GUESSES.get(args.length)
+
+    start = time.perf_counter()
+    depths = []
+    tree = build_decision_tree(
+        equations,
+        first_guess=first_guess,
+        max_turns=max_turns,
+        alternatives=args.alternatives,
+        depths=depths,
+    )
+    elapsed = time.perf_counter() - start
+
+    max_depth = max(depths)
+    print(f"✓ 构建完成，用时 {elapsed:.1f} 秒")
+    print(f"平均尝试次数: {sum(depths) / len(depths):.4f}，最多: {max_depth}")
+    for turns, count in sorted(Counter(depths).items()):
+        print(f"  {turns} 次: {count}")
+    if max_depth > max_turns:
+        print(f"⚠️ 有答案需要超过 {max_turns} 次尝试，可增大 --alternatives 后重试")
+
+    path = tree_file(args.length)
+    save_decision_tree(tree, equations, path, max_depth)
+    print(f"✓ 已保存到 {path}")
+
+
+if __name__ == "__main__":
+    main()
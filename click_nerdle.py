@@ -1,4 +1,3 @@
-# 独立实现
 """
 Nerdle Game 自动点击器 - Edge浏览器Windows优化版本
 使用 Selenium 模拟浏览器点击关闭按钮（可视化界面）
@@ -21,6 +20,18 @@ from selenium.common.exceptions import (
     WebDriverException
 )
 
+# 求解部分与插件共用 nonebot_plugin_nerdle_autoplay/solver.py
+from plugin_loader import register_plugin_package
+
+register_plugin_package()
+
+from nonebot_plugin_nerdle_autoplay.solver import (  # noqa: E402
+    CandidateSet,
+    ConstraintIndex,
+    safe_find_elements,
+    suggest_next_guess,
+)
+
 def load_equations_from_file():
     """
     从同目录下的 dic-8.json 文件中读取所有等式
@@ -45,107 +56,6 @@ def load_equations_from_file():
     print(f"✓ 从文件读取了 {len(valid_equations)} 个合法等式")
     return valid_equations
 
-def nerdle_feedback(answer: str, guess: str):
-    result = []
-    used = [False] * 8
-
-    # correct
-    for i in range(8):
-        if guess[i] == answer[i]:
-            result.append({"char": guess[i], "status": "correct"})
-            used[i] = True
-        else:
-            result.append(None)
-
-    # present / absent
-    for i in range(8):
-        if result[i] is not None:
-            continue
-
-        found = False
-        for j in range(8):
-            if not used[j] and guess[i] == answer[j]:
-                used[j] = True
-                found = True
-                break
-
-        result[i] = {
-            "char": guess[i],
-            "status": "present" if found else "absent"
-        }
-
-    return result
-
-def suggest_next_guess(candidates, history):
-    """
-    选择下一个猜测的等式
-    对于candidates内剩余的每个等式，将所有候选等式依次作为answer，
-    当前等式作为guess传到nerdle_feedback里并获得若干个反馈，
-    将每个等式获得的反馈去重后选择不同反馈数量最多的等式并返回
-    """
-    if not candidates:
-        return None
-    
-    best_guess = None
-    max_unique_feedbacks = 0
-    
-    for guess_candidate in candidates:
-        # 存储当前guess_candidate的所有反馈
-        all_feedbacks = []
-        
-        # 对于candidates中的每个等式作为answer
-        for answer_candidate in candidates:
-            # 计算反馈
-            feedback = nerdle_feedback(answer_candidate, guess_candidate)
-            # 将反馈转换为可哈希的元组形式以便去重
-            feedback_tuple = tuple((item['char'], item['status']) for item in feedback)
-            all_feedbacks.append(feedback_tuple)
-        
-        # 去重并计算不同反馈的数量
-        unique_feedbacks = set(all_feedbacks)
-        unique_count = len(unique_feedbacks)
-        
-        # 选择不同反馈数量最多的等式
-        if unique_count > max_unique_feedbacks:
-            max_unique_feedbacks = unique_count
-            best_guess = guess_candidate
-        # 如果数量相同，保持第一个找到的
-    
-    return best_guess if best_guess else candidates[0]
-
-def safe_find_elements(driver, by, selector, retries=3):
-    """安全地查找元素，处理stale element异常"""
-    for attempt in range(retries):
-        try:
-            return driver.find_elements(by, selector)
-        except StaleElementReferenceException:
-            if attempt < retries - 1:
-                time.sleep(0.3)  # 增加等待时间
-                continue
-            raise
-    return []
-
-def filter_candidates_by_feedback(candidates, guess, real_feedback):
-    """
-    只保留：在假设 candidate 是答案时，
-    它对 guess 产生的反馈 == 实际反馈
-    """
-    filtered = []
-
-    for cand in candidates:
-        simulated = nerdle_feedback(cand, guess)
-
-        ok = True
-        for i in range(8):
-            if simulated[i]["status"] != real_feedback[i]["status"]:
-                ok = False
-                break
-
-        if ok:
-            filtered.append(cand)
-
-    return filtered
-
 def click_nerdle_close_button():
     # 使用Edge浏览器选项 - Windows优化
     edge_options = Options()
@@ -269,14 +179,14 @@ def click_nerdle_close_button():
         all_candidates = load_equations_from_file()
         print(f"✓ 共加载 {len(all_candidates)} 个候选等式")
         
-        candidates = all_candidates[:]
+        candidates = CandidateSet(ConstraintIndex(all_candidates))
         history = []
         first_guess = "1+56/7=9"
         
         attempt = 0
         while attempt < 6:
             print(f"\n第 {attempt + 1}/6 次尝试")
-            user_input = suggest_next_guess(candidates, history) if attempt > 0 else first_guess
+            user_input = suggest_next_guess(candidates.to_list(), history) if attempt > 0 else first_guess
             print(f"使用: {user_input}")
             
             # 键盘输入
@@ -424,17 +334,13 @@ def click_nerdle_close_button():
                             input("按Enter键继续...")
                             break
                         
-                        # 过滤候选
+                        # 在位集上收窄候选（与逐条过滤结果一致）
                         history.append({"guess": user_input, "feedback": result})
-                        candidates = all_candidates[:]
-                        for h in history:
-                            candidates = filter_candidates_by_feedback(
-                                candidates, h['guess'], h['feedback']
-                            )
+                        candidates = candidates.narrow(user_input, result)
                         
                         print(f"剩余: {len(candidates)} 个")
                         if len(candidates) > 0:
-                            print(f"💡 {suggest_next_guess(candidates, history)}")
+                            print(f"💡 {suggest_next_guess(candidates.to_list(), history)}")
                             if len(candidates) <= 10:
                                 print(f"全部: {', '.join(candidates)}")
                         else:
@@ -1,12 +1,12 @@
 # 由 nonebot_plugin_nerdle 的 __init__.py 改变而来
 import asyncio
 import time
-import json
 from datetime import datetime, timedelta
 from typing import Annotated, Any
-from pathlib import Path
 
 from nonebot import on_command, require, get_driver, get_bots
+from nonebot.adapters import Bot
+from nonebot.drivers import URL, ASGIMixin, HTTPServerSetup, Request, Response
 from nonebot.log import logger
 from nonebot.matcher import Matcher
 from nonebot.params import Depends
@@ -26,13 +26,39 @@ from nonebot_plugin_alconna import (
     Image,
     Option,
     Query,
+    Target,
     Text,
     UniMessage,
     on_alconna,
 )
 from nonebot_plugin_uninfo import Uninfo
 
-from .data_source import NerdleAutoPlayer, GameHistory
+from .admission import AdmissionController, QueueFullError
+from .cache import (
+    SHARED_CACHE_ID,
+    aclean_old_caches,
+    aclear_caches,
+    aload_cached_result,
+    arender_final_png,
+    asave_cached_result,
+    cache_id,
+    clock,
+)
+from .config import Config, plugin_config
+from .data_source import VARIANTS, NerdleAutoPlayer, GameHistory, play_in_tabs
+from .metrics import (
+    AUTOPLAY_INVOCATIONS,
+    CONTENT_TYPE,
+    GAME_DURATION,
+    GAME_TURNS,
+    registry,
+)
+from .pacing import MessageScheduler
+from .profiling import PROFILE_DIR, profiler
+from .snapshot import SessionSnapshot
+from .solver import SOLVER_MODES, UNKNOWN_CODE
+from .stream import GameStream
+from .timing import TimingStats, format_timing_record
 
 __version__ = "0.1.0"
 
@@ -40,14 +66,17 @@ __plugin_meta__ = PluginMetadata(
     name="nerdle演示",
     description="自动玩nerdle猜等式游戏，演示完整交互过程",
     usage=(
-        "@我/私聊 + \"nerdle autoplay\"开始自动游戏\n"
+        "@我/私聊 + \"nerdle autoplay [classic/midi/mini] [hard/free/hybrid]\"开始自动游戏（可指定游戏模式与求解模式）\n"
         "@我/私聊 + \"nerdle 清除缓存\"清除当前窗口缓存（仅超级管理员）\n"
         "@我/私聊 + \"nerdle 全局清除缓存\"清除所有缓存（仅超级管理员）\n"
+        "@我/私聊 + \"nerdle 耗时统计\"查看各阶段耗时 p50/p95（仅超级管理员）\n"
+        "@我/私聊 + \"nerdle 性能分析 [开启/关闭]\"切换热点函数性能分析（仅超级管理员）\n"
         "插件将自动访问 nerdlegame.com，模拟完整游戏过程\n"
         "每日首次运行会缓存结果，后续调用直接返回缓存\n"
-        "相邻消息间隔 5 秒，展示每一步的猜测和反馈"
+        "游戏进行中每完成一步即展示猜测和反馈，消息间隔与合并方式可在配置中调整"
     ),
     type="application",
+    config=Config,
     homepage="https://github.com/Lovable-xlz/nonebot_plugin_nerdle_autoplay",
     supported_adapters=inherit_supported_adapters(
         "nonebot_plugin_alconna", "nonebot_plugin_uninfo"
@@ -57,160 +86,64 @@ __plugin_meta__ = PluginMetadata(
     }
 )
 
-# 缓存目录
-CACHE_DIR = Path(__file__).parent / "cache"
-CACHE_DIR.mkdir(exist_ok=True)
+scheduler = MessageScheduler(plugin_config)
+admission = AdmissionController(
+    plugin_config.nerdle_max_concurrent_games, plugin_config.nerdle_max_queue
+)
+timing_stats = TimingStats()
+# 清除过个人缓存的用户（值为清除时的题号）：当日题目不再使用每日预热的共享缓存
+shared_cache_bypass: dict[str, int] = {}
+profiler.enabled = plugin_config.nerdle_profiling
+profiler.keep = plugin_config.nerdle_profile_keep
+snapshot = (
+    SessionSnapshot(max_age_days=plugin_config.nerdle_snapshot_max_age_days)
+    if plugin_config.nerdle_session_snapshot
+    else None
+)
+
+
+def new_player(variant: str = "classic", mode: str = "") -> NerdleAutoPlayer:
+    """按配置的浏览器后端与求解模式创建自动玩家"""
+    return NerdleAutoPlayer(
+        variant=variant,
+        mode=mode or plugin_config.nerdle_solver_mode,
+        hybrid_threshold=plugin_config.nerdle_hybrid_threshold,
+        browser=plugin_config.nerdle_browser,
+        headless=plugin_config.nerdle_headless,
+        browser_binary=plugin_config.nerdle_browser_binary,
+        driver_path=plugin_config.nerdle_driver_path,
+        block_resources=plugin_config.nerdle_block_resources,
+        extra_blocked_urls=plugin_config.nerdle_blocked_urls,
+        fast_path=plugin_config.nerdle_state_fast_path,
+        snapshot=snapshot,
+    )
+
 
 def get_user_id(uninfo: Uninfo) -> str:
     return f"{uninfo.scope}_{uninfo.self_id}_{uninfo.scene_path}"
 
 UserId = Annotated[str, Depends(get_user_id)]
 
-def get_cache_file(user_id: str, timestamp: datetime = None) -> Path:
-    """获取用户缓存文件路径（精确到分钟）"""
-    if timestamp is None:
-        timestamp = datetime.now()
-    # 格式：用户ID_年月日_时分.json
-    time_str = timestamp.strftime("%Y-%m-%d_%H-%M")
-    return CACHE_DIR / f"{user_id}_{time_str}.json"
-
-def is_cache_valid(cache_file: Path) -> bool:
-    """检查缓存是否有效（在当天8点之后创建）"""
-    if not cache_file.exists():
-        return False
-    
-    try:
-        # 从文件名中提取时间
-        filename = cache_file.stem
-        # 格式：用户ID_年月日_时分
-        parts = filename.split('_')
-        if len(parts) < 3:
-            return False
-        
-        date_str = parts[-2]  # 年月日
-        time_str = parts[-1]  # 时分
-        
-        # 解析日期时间
-        cache_datetime = datetime.strptime(f"{date_str}_{time_str}", "%Y-%m-%d_%H-%M")
-        
-        # 获取缓存日期的8点
-        cache_date_8am = datetime(cache_datetime.year, cache_datetime.month, cache_datetime.day, 8, 0)
-        
-        # 检查是否在8点之后创建
-        return cache_datetime >= cache_date_8am
-    except Exception as e:
-        logger.error(f"检查缓存有效性失败: {e}")
-        return False
-
-def load_cached_result(user_id: str) -> GameHistory | None:
-    """加载缓存结果"""
-    try:
-        # 查找用户的所有缓存文件
-        cache_pattern = f"{user_id}_*.json"
-        cache_files = list(CACHE_DIR.glob(cache_pattern))
-        
-        if not cache_files:
-            return None
-        
-        # 按修改时间排序，最新的在前
-        cache_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-        
-        # 检查每个缓存文件的有效性
-        valid_caches = []
-        for cache_file in cache_files:
-            if is_cache_valid(cache_file):
-                valid_caches.append(cache_file)
-            else:
-                # 删除无效缓存（8点之前的）
-                try:
-                    cache_file.unlink()
-                    logger.info(f"删除无效缓存: {cache_file.name}")
-                except Exception as e:
-                    logger.error(f"删除缓存失败: {e}")
-        
-        if not valid_caches:
-            return None
-        
-        # 使用最新的有效缓存
-        latest_cache = valid_caches[0]
-        try:
-            with open(latest_cache, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                history = GameHistory.from_dict(data)
-                logger.info(f"加载缓存: {latest_cache.name}")
-                return history
-        except Exception as e:
-            logger.error(f"加载缓存文件失败: {e}")
-            # 如果加载失败，删除损坏的缓存文件
-            try:
-                latest_cache.unlink()
-            except:
-                pass
-            return None
-    except Exception as e:
-        logger.error(f"加载缓存结果失败: {e}")
-        return None
-
-def save_cached_result(user_id: str, history: GameHistory):
-    """保存缓存结果（如果在7:55~8:05之间则不保存）"""
-    now = datetime.now()
-    
-    # 检查是否在7:55~8:05之间
-    current_time = now.time()
-    no_cache_start = datetime.strptime("07:55", "%H:%M").time()
-    no_cache_end = datetime.strptime("08:05", "%H:%M").time()
+def record_game_timings(history: GameHistory):
+    """输出并汇总一局游戏的耗时记录"""
+    for phase, seconds in history.timings.items():
+        logger.info(f"nerdle_timing {format_timing_record('game', phase, seconds)}")
+        timing_stats.add(phase, seconds)
     
-    if no_cache_start <= current_time <= no_cache_end:
-        logger.info(f"当前时间 {current_time} 在7:55~8:05之间，不保存缓存")
-        return
-    
-    try:
-        # 删除用户的所有旧缓存
-        cache_pattern = f"{user_id}_*.json"
-        for old_cache in CACHE_DIR.glob(cache_pattern):
-            try:
-                old_cache.unlink()
-                logger.info(f"删除旧缓存: {old_cache.name}")
-            except Exception as e:
-                logger.error(f"删除旧缓存失败: {e}")
-        
-        # 创建新缓存
-        cache_file = get_cache_file(user_id, now)
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(history.to_dict(), f, ensure_ascii=False, indent=2)
-        logger.info(f"保存缓存: {cache_file.name}")
-    except Exception as e:
-        logger.error(f"保存缓存失败: {e}")
-
-def clean_old_caches():
-    """清理所有8点以前的缓存文件"""
-    try:
-        cache_files = list(CACHE_DIR.glob("*.json"))
-        deleted_count = 0
-        
-        for cache_file in cache_files:
-            if not is_cache_valid(cache_file):
-                try:
-                    cache_file.unlink()
-                    deleted_count += 1
-                    logger.info(f"清理过期缓存: {cache_file.name}")
-                except Exception as e:
-                    logger.error(f"清理缓存失败: {e}")
-        
-        if deleted_count > 0:
-            logger.info(f"共清理 {deleted_count} 个过期缓存文件")
-    except Exception as e:
-        logger.error(f"清理缓存时出错: {e}")
+    for turn, step in enumerate(history.steps, 1):
+        for phase, seconds in step.timings.items():
+            logger.info(f"nerdle_timing {format_timing_record('turn', phase, seconds, turn=turn)}")
+            timing_stats.add(f"turn.{phase}", seconds)
 
 from arclet.alconna import Alconna, Args, CommandMeta
 
 # 创建 Alconna 命令
 autoplay_alc_command = Alconna(
     "nerdle autoplay",
-    Args["force?", bool],
+    Args["variant?", list(VARIANTS)]["mode?", list(SOLVER_MODES)]["force?", bool],
     meta=CommandMeta(
         description="nerdle自动游戏",
-        example="nerdle autoplay [--force]",
+        example="nerdle autoplay [mini] [hard] [--force]",
     ),
 )
 
@@ -232,6 +165,25 @@ clear_all_cache_alc_command = Alconna(
     ),
 )
 
+# 创建耗时统计的命令
+timing_alc_command = Alconna(
+    "nerdle 耗时统计",
+    meta=CommandMeta(
+        description="查看nerdle各阶段耗时统计（仅超级管理员）",
+        example="nerdle 耗时统计",
+    ),
+)
+
+# 创建性能分析开关的命令
+profiling_alc_command = Alconna(
+    "nerdle 性能分析",
+    Args["action?", ["开启", "关闭"]],
+    meta=CommandMeta(
+        description="切换nerdle热点函数性能分析（仅超级管理员）",
+        example="nerdle 性能分析 开启",
+    ),
+)
+
 # 创建匹配器
 matcher_autoplay = on_alconna(
     autoplay_alc_command,
@@ -256,51 +208,109 @@ matcher_clear_all_cache = on_alconna(
     permission=SUPERUSER,  # 仅超级管理员可用
 )
 
+matcher_timing = on_alconna(
+    timing_alc_command,
+    use_cmd_start=True,
+    block=True,
+    priority=13,
+    permission=SUPERUSER,  # 仅超级管理员可用
+)
+
+matcher_profiling = on_alconna(
+    profiling_alc_command,
+    use_cmd_start=True,
+    block=True,
+    priority=13,
+    permission=SUPERUSER,  # 仅超级管理员可用
+)
+
 @matcher_autoplay.handle()
 async def _(
+    bot: Bot,
     matcher: Matcher,
     user_id: UserId,
     alc_matches: AlcMatches,
+    variant: Query[str] = AlconnaQuery("variant", "classic"),
+    solver_mode: Query[str] = AlconnaQuery("mode", ""),
     force: Query[bool] = AlconnaQuery("force", False),
 ):
-    # 先清理过期缓存
-    await run_sync(clean_old_caches)()
+    AUTOPLAY_INVOCATIONS.inc(force=str(bool(force.result)).lower())
+    
+    adapter = bot.adapter.get_name()
+    mode = variant.result
+    key = cache_id(user_id, mode)
     
     # 检查是否强制重新运行
     if not force.result:
-        # 尝试加载缓存
-        cached_history = load_cached_result(user_id)
+        # 尝试加载缓存（本会话没有时使用每日预热的共享缓存，清除过缓存的用户除外）
+        cached_history = await aload_cached_result(key)
+        if not cached_history and shared_cache_bypass.get(user_id) != clock.puzzle_number():
+            cached_history = await aload_cached_result(cache_id(SHARED_CACHE_ID, mode))
         if cached_history:
             logger.info(f"用户 {user_id} 使用缓存结果")
-            await send_cached_result(matcher, cached_history)
+            await send_cached_result(matcher, cached_history, adapter)
             return
     
     # 显示开始消息
-    await UniMessage.text("🚀🚀 开始 Nerdle Autoplay...").send()
-    await asyncio.sleep(1)
+    await scheduler.throttle(adapter)
+    title = "Nerdle" if mode == "classic" else f"{mode.capitalize()} Nerdle"
+    await UniMessage.text(f"🚀🚀 开始 {title} Autoplay...").send()
+    await scheduler.pause(plugin_config.nerdle_intro_interval)
     
     # 创建自动玩家
-    player = NerdleAutoPlayer()
+    # 首次创建某一长度的玩家需要加载词典，放到线程中以免阻塞事件循环
+    player = await run_sync(new_player)(mode, solver_mode.result)
+    profile = profiler.start_game()
+    
+    async def on_queued(position: int):
+        await scheduler.throttle(adapter)
+        await UniMessage.text(
+            f"⏳ 当前已有 {admission.running} 局游戏在进行，您排在第 {position} 位，请稍候..."
+        ).send()
     
     try:
-        # 运行自动游戏（在异步线程中执行同步代码）
-        await UniMessage.text("🤓👆 正在启动浏览器并游玩，预计需要 5 分钟时间，请耐心等待...").send()
-        await asyncio.sleep(1)
+        # 运行自动游戏（在异步线程中执行同步代码），每完成一步立即发送
+        await scheduler.throttle(adapter)
+        await UniMessage.text("🤓👆 正在启动浏览器并游玩，每完成一步都会立即展示，请耐心等待...").send()
         
-        history = await run_sync(player.run_auto_game)()
+        # 游戏名额只在浏览器游戏进行期间占用，游戏结束后剩余步骤的发送不占名额
+        stream = GameStream(player, admission.slot(on_queued))
+        async for partial_history, index in stream:
+            await send_game_step(partial_history, index, adapter)
+        history = stream.result
+        timing_stats.add("queue_wait", round(stream.waited, 4))
         
         if history:
-            # 保存缓存
-            save_cached_result(user_id, history)
+            record_game_timings(history)
+            GAME_TURNS.observe(len(history.steps))
+            if "total" in history.timings:
+                GAME_DURATION.observe(history.timings["total"])
+            
+            # 保存缓存，之后该用户使用自己的缓存（未解出时不缓存，下次重新游玩）
+            if history.solved:
+                await asave_cached_result(key, history)
+                shared_cache_bypass.pop(user_id, None)
             
             # 发送最终结果
-            await send_auto_game_result(matcher, history)
+            await send_final_result(history, adapter)
         else:
             await UniMessage.text("❌ 自动游戏失败，请稍后重试").send()
             
+    except QueueFullError:
+        await UniMessage.text(
+            f"❌ 当前排队人数已满（{admission.max_queue} 人），请稍后再试"
+        ).send()
     except Exception as e:
         logger.error(f"自动游戏异常: {e}")
         await UniMessage.text(f"❌ 游戏执行出错: {e}").send()
+    finally:
+        if profile is not None:
+            try:
+                profile_file = await run_sync(profiler.dump)(profile, user_id)
+                if profile_file is not None:
+                    logger.info(f"保存性能分析: {profile_file.name}")
+            except Exception as e:
+                logger.error(f"保存性能分析失败: {e}")
 
 @matcher_clear_cache.handle()
 async def handle_clear_cache(
@@ -309,24 +319,15 @@ async def handle_clear_cache(
 ):
     """清除个人缓存"""
     try:
-        # 查找用户的所有缓存文件
-        cache_pattern = f"{user_id}_*.json"
-        cache_files = list(CACHE_DIR.glob(cache_pattern))
+        deleted_count = await aclear_caches(user_id)
+        # 下次调用重新游玩，而不是改用每日预热的共享缓存
+        shared_cache_bypass[user_id] = clock.puzzle_number()
         
-        if not cache_files:
-            await UniMessage.text("您没有 nerdle 缓存文件").send()
+        if not deleted_count:
+            await UniMessage.text("您没有 nerdle 缓存文件，下次将重新游玩").send()
             return
         
-        deleted_count = 0
-        for cache_file in cache_files:
-            try:
-                cache_file.unlink()
-                deleted_count += 1
-                logger.info(f"删除缓存: {cache_file.name}")
-            except Exception as e:
-                logger.error(f"删除缓存失败: {e}")
-        
-        await UniMessage.text(f"已清除 {deleted_count} 个您的 nerdle 缓存文件").send()
+        await UniMessage.text(f"已清除 {deleted_count} 个您的 nerdle 缓存文件，下次将重新游玩").send()
         
     except Exception as e:
         logger.error(f"清除缓存失败: {e}")
@@ -336,73 +337,241 @@ async def handle_clear_cache(
 async def handle_clear_all_cache(matcher: Matcher):
     """全局清除所有缓存"""
     try:
-        cache_files = list(CACHE_DIR.glob("*.json"))
+        deleted_count = await aclear_caches()
         
-        if not cache_files:
+        if not deleted_count:
             await UniMessage.text("📭 没有nerdle缓存文件").send()
             return
         
-        deleted_count = 0
-        for cache_file in cache_files:
-            try:
-                cache_file.unlink()
-                deleted_count += 1
-                logger.info(f"删除缓存: {cache_file.name}")
-            except Exception as e:
-                logger.error(f"删除缓存失败: {e}")
-        
         await UniMessage.text(f"✅ 已全局清除 {deleted_count} 个nerdle缓存文件").send()
         
     except Exception as e:
         logger.error(f"全局清除缓存失败: {e}")
         await UniMessage.text(f"❌ 全局清除缓存失败: {e}").send()
 
-async def send_auto_game_result(matcher: Matcher, history: GameHistory):
-    """发送自动游戏结果"""
-    # 逐步发送每一步的过程
-    await UniMessage.text(f"✍✍ 游戏结束，共进行了 {len(history.steps)} 次尝试").send()
-    await asyncio.sleep(1)
+@matcher_timing.handle()
+async def handle_timing(matcher: Matcher):
+    """查看耗时统计"""
+    summary = timing_stats.summary()
+    if not summary:
+        await UniMessage.text("📭 暂无nerdle耗时记录").send()
+        return
     
-    for i, step in enumerate(history.steps, 1):
-        await UniMessage.text(f"第 {i} 次尝试: {step.guess}").send()
-        await asyncio.sleep(2)
-        
-        # 使用 render_step_image 渲染当前步骤的状态
-        step_image = await run_sync(history.render_step_image)(i - 1)  # i-1 因为索引从0开始
-        await UniMessage.image(raw=step_image).send()
-        await asyncio.sleep(3)  # 每条消息间隔3秒
+    lines = ["⏱ nerdle 各阶段耗时（秒）:"]
+    for phase, count, p50, p95 in summary:
+        lines.append(f"{phase}: p50={p50:.2f} p95={p95:.2f} (n={count})")
+    await UniMessage.text("\n".join(lines)).send()
+
+@matcher_profiling.handle()
+async def handle_profiling(
+    matcher: Matcher,
+    action: Query[str] = AlconnaQuery("action", ""),
+):
+    """切换性能分析"""
+    if action.result == "开启":
+        profiler.enabled = True
+    elif action.result == "关闭":
+        profiler.enabled = False
     
-    # 发送最终结果
+    state = "已开启" if profiler.enabled else "已关闭"
+    await UniMessage.text(f"🔬 nerdle 性能分析{state}，结果保存在 {PROFILE_DIR}").send()
+
+async def send_game_step(history: GameHistory, index: int, adapter: str):
+    """发送游戏中的一步"""
+    step = history.steps[index]
+    # 使用 render_step_image 渲染当前步骤的状态
+    step_image = await run_sync(history.render_step_image)(index)
+    step_text = f"第 {index + 1} 次尝试: {step.guess}"
+    if UNKNOWN_CODE in step.pattern:
+        step_text += "（未能读取反馈）"
+    
+    if scheduler.compact:
+        # 合并文字与图片为一条消息
+        await scheduler.throttle(adapter)
+        await (
+            UniMessage.template("{text}\n{image}")
+            .format(text=step_text, image=Image(raw=step_image))
+            .send()
+        )
+        return
+    
+    await scheduler.throttle(adapter)
+    await UniMessage.text(step_text).send()
+    await scheduler.pause(plugin_config.nerdle_step_text_interval)
+    
+    await scheduler.throttle(adapter)
+    await UniMessage.image(raw=step_image).send()
+    await scheduler.pause(plugin_config.nerdle_step_image_interval)
+
+async def send_final_result(history: GameHistory, adapter: str):
+    """发送自动游戏最终结果"""
     # 使用 render_final_image 渲染最终状态
     final_image = await run_sync(history.render_final_image)()
-    result_text = f"🎉🎉🎉 游戏结束！最终答案: {history.answer}"
+    result_text = (
+        f"🎉🎉🎉 游戏结束！共进行了 {len(history.steps)} 次尝试，最终答案: {history.answer}"
+    )
     
+    await scheduler.throttle(adapter)
     await (
         UniMessage.template("{result}\n{image}")
         .format(result=result_text, image=Image(raw=final_image))
         .send()
     )
 
-async def send_cached_result(matcher: Matcher, history: GameHistory):
+async def send_cached_result(matcher: Matcher, history: GameHistory, adapter: str):
     """发送缓存结果"""
+    final_image = await arender_final_png(history)
+    result_text = f"最终答案: {history.answer}"
+    
+    if scheduler.compact:
+        await scheduler.throttle(adapter)
+        await (
+            UniMessage.template("📅 使用今日缓存结果:\n😋😋 {result}\n{image}")
+            .format(result=result_text, image=Image(raw=final_image))
+            .send()
+        )
+        return
+    
+    await scheduler.throttle(adapter)
     await UniMessage.text("📅 使用今日缓存结果:").send()
-    await asyncio.sleep(1)
+    await scheduler.pause(plugin_config.nerdle_intro_interval)
     
     # 发送最终结果
-    final_image = await run_sync(history.render_final_image)()
-    result_text = f"最终答案: {history.answer}"
-    
+    await scheduler.throttle(adapter)
     await (
         UniMessage.template("😋😋 {result}\n{image}")
         .format(result=result_text, image=Image(raw=final_image))
         .send()
     )
 
-# 在插件加载时清理过期缓存
+async def metrics_endpoint(request: Request) -> Response:
+    """以 Prometheus 文本格式暴露插件指标"""
+    return Response(
+        200,
+        headers={"Content-Type": CONTENT_TYPE},
+        content=registry.render(),
+    )
+
+driver = get_driver()
+if plugin_config.nerdle_metrics_path and isinstance(driver, ASGIMixin):
+    driver.setup_http_server(
+        HTTPServerSetup(
+            URL(plugin_config.nerdle_metrics_path),
+            "GET",
+            "nerdle_metrics",
+            metrics_endpoint,
+        )
+    )
+elif plugin_config.nerdle_metrics_path:
+    logger.warning("当前驱动器不支持 HTTP 服务端，nerdle 指标不会被暴露")
+
+async def compaction_loop():
+    """定期压缩缓存目录"""
+    interval = max(plugin_config.nerdle_cache_compact_interval, 1) * 60
+    while True:
+        await aclean_old_caches()
+        await asyncio.sleep(interval)
+
+compaction_task: asyncio.Task | None = None
+
+# 在插件加载时清理过期缓存，之后定期压缩
 @get_driver().on_startup
 async def startup_cleanup():
-    """启动时清理过期缓存"""
+    """启动时清理过期缓存并开始定期压缩"""
+    global compaction_task
     logger.info("启动时清理nerdle过期缓存...")
+    compaction_task = asyncio.create_task(compaction_loop())
 
-    await run_sync(clean_old_caches)()
+async def notify_superusers(message: str):
+    """向所有超级管理员发送私聊通知"""
+    for bot in get_bots().values():
+        for superuser in get_driver().config.superusers:
+            try:
+                await UniMessage.text(message).send(
+                    target=Target(superuser, private=True), bot=bot
+                )
+            except Exception as e:
+                logger.warning(f"通知超级管理员 {superuser} 失败: {e}")
+
+def next_prewarm_time(now: datetime) -> datetime:
+    """下一次预热的时间（题目切换后延迟若干分钟）"""
+    delay = timedelta(minutes=plugin_config.nerdle_prewarm_delay_minutes)
+    run_at = clock.rollover_at(clock.puzzle_date(now)) + delay
+    if run_at <= now:
+        run_at = clock.next_rollover(now) + delay
+    return run_at
+
+async def pending_prewarm_variants() -> list[str]:
+    """尚无共享缓存的预热模式"""
+    return [
+        variant for variant in dict.fromkeys(plugin_config.nerdle_prewarm_variants)
+        if not await aload_cached_result(cache_id(SHARED_CACHE_ID, variant))
+    ]
+
+async def prewarm_daily_result(variants: list[str]) -> bool:
+    """游玩当日题目并写入共享缓存，失败时按指数退避重试
+
+    多个模式共用一个浏览器（各占一个标签页）同时进行，重试时只重玩失败的模式。
+    """
+    delay = plugin_config.nerdle_prewarm_backoff
+    attempts = plugin_config.nerdle_prewarm_retries + 1
+    for attempt in range(1, attempts + 1):
+        try:
+            players = [await run_sync(new_player)(variant) for variant in variants]
+            async with admission.slot():
+                if len(players) == 1:
+                    histories = [await run_sync(players[0].run_auto_game)()]
+                else:
+                    histories = await run_sync(play_in_tabs)(players)
+            
+            failed = []
+            for variant, history in zip(variants, histories):
+                if history and history.solved:
+                    record_game_timings(history)
+                    await asave_cached_result(cache_id(SHARED_CACHE_ID, variant), history)
+                    await arender_final_png(history)
+                    logger.info(f"nerdle 每日预热完成（{variant}），答案: {history.answer}")
+                else:
+                    failed.append(variant)
+            if not failed:
+                return True
+            variants = failed
+            logger.warning(f"nerdle 每日预热第 {attempt} 次失败: {', '.join(failed)}")
+        except Exception as e:
+            logger.error(f"nerdle 每日预热第 {attempt} 次出错: {e}")
+        if attempt < attempts:
+            await asyncio.sleep(delay)
+            delay *= 2
+    return False
+
+async def prewarm_loop():
+    """每日预热任务"""
+    while True:
+        run_at = next_prewarm_time(clock.now())
+        logger.info(f"nerdle 下一次每日预热时间: {run_at:%Y-%m-%d %H:%M %Z}")
+        await asyncio.sleep((run_at - clock.now()).total_seconds())
+        
+        variants = await pending_prewarm_variants()
+        if not variants:
+            continue
+        if not await prewarm_daily_result(variants):
+            await notify_superusers(
+                f"❌ nerdle 每日预热失败（已重试 {plugin_config.nerdle_prewarm_retries} 次），"
+                "首位用户将触发实时游玩"
+            )
+
+prewarm_task: asyncio.Task | None = None
+
+@get_driver().on_startup
+async def start_prewarm():
+    """启动每日预热任务"""
+    global prewarm_task
+    if plugin_config.nerdle_prewarm_enabled:
+        prewarm_task = asyncio.create_task(prewarm_loop())
 
+@get_driver().on_shutdown
+async def stop_background_tasks():
+    """停止每日预热与缓存压缩任务"""
+    for task in (prewarm_task, compaction_task):
+        if task and not task.done():
+            task.cancel()
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Deque, Optional
+
+from .metrics import GAMES_REJECTED, GAMES_RUNNING, QUEUE_DEPTH, QUEUE_WAIT_SECONDS
+
+
+class QueueFullError(Exception):
+    """排队人数已满"""
+
+
+class AdmissionController:
+    """浏览器游戏的准入控制：限制同时进行的局数，其余请求按先来后到排队"""
+
+    def __init__(self, max_concurrent: int = 1, max_queue: int = 5):
+        self.max_concurrent = max(max_concurrent, 1)
+        self.max_queue = max(max_queue, 0)
+        self.running = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self.waiters)
+
+    def _update_gauges(self):
+        GAMES_RUNNING.set(self.running)
+        QUEUE_DEPTH.set(len(self.waiters))
+
+    def _release(self):
+        # 直接把名额交给队首的等待者，保证先来先服务
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._update_gauges()
+                return
+        self.running -= 1
+        self._update_gauges()
+
+    @asynccontextmanager
+    async def slot(
+        self, on_queued: Optional[Callable[[int], Awaitable[None]]] = None
+    ) -> AsyncIterator[float]:
+        """获取一个游戏名额，返回排队等待的秒数
+
+        需要排队时以排队位置（从 1 开始）调用 `on_queued`，队列已满时抛出 `QueueFullError`。
+        """
+        start = time.monotonic()
+        if self.running < self.max_concurrent and not self.waiters:
+            self.running += 1
+            self._update_gauges()
+        else:
+            if len(self.waiters) >= self.max_queue:
+                GAMES_REJECTED.inc()
+                raise QueueFullError
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            self._update_gauges()
+            try:
+                if on_queued:
+                    await on_queued(len(self.waiters))
+                await waiter
+            except BaseException:
+                if waiter.done() and not waiter.cancelled():
+                    # 已经拿到名额但被取消，交给下一位
+                    self._release()
+                else:
+                    waiter.cancel()
+                    if waiter in self.waiters:
+                        self.waiters.remove(waiter)
+                    self._update_gauges()
+                raise
+
+        waited = time.monotonic() - start
+        QUEUE_WAIT_SECONDS.observe(waited)
+        try:
+            yield waited
+        finally:
+            self._release()
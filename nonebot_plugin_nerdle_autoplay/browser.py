@@ -0,0 +1,398 @@
+# 浏览器驱动后端，由 data_source.py 中的 setup_driver 拆分而来
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Type
+
+from .lazy import LazyImport
+
+# selenium.webdriver 会连带导入所有浏览器的实现，推迟到第一次启动浏览器时再导入
+webdriver = LazyImport("selenium.webdriver")
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0"
+)
+
+# 无头模式下的窗口大小，足够显示完整棋盘即可
+WINDOW_SIZE = (800, 900)
+
+# 导航前屏蔽的请求（广告、统计、同意弹窗、字体与图片），均与游戏逻辑无关
+BLOCKED_URL_PATTERNS = [
+    "*googletagmanager.com*",
+    "*google-analytics.com*",
+    "*googlesyndication.com*",
+    "*googleadservices.com*",
+    "*doubleclick.net*",
+    "*adservice.google.*",
+    "*fundingchoicesmessages.google.com*",
+    "*amazon-adsystem.com*",
+    "*adnxs.com*",
+    "*pubmatic.com*",
+    "*rubiconproject.com*",
+    "*criteo.*",
+    "*taboola.com*",
+    "*outbrain.com*",
+    "*quantserve.com*",
+    "*quantcast.*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*fonts.googleapis.com*",
+    "*fonts.gstatic.com*",
+    "*.woff*",
+    "*.ttf*",
+    "*.otf*",
+    "*.png*",
+    "*.jpg*",
+    "*.jpeg*",
+    "*.gif*",
+    "*.webp*",
+    "*.mp4*",
+]
+
+
+class DriverBackend:
+    """浏览器后端基类"""
+
+    name = ""
+    display_name = ""
+
+    def __init__(
+        self,
+        headless: bool = True,
+        binary: str = "",
+        driver_path: str = "",
+        blocked_urls: Optional[List[str]] = None,
+    ):
+        self.headless = headless
+        self.binary = binary
+        self.driver_path = driver_path
+        self.blocked_urls = blocked_urls or []
+
+    def build_options(self):
+        raise NotImplementedError
+
+    def create(self, options, driver_path: Optional[str] = None):
+        raise NotImplementedError
+
+    def driver_paths(self) -> List[str]:
+        """默认方式启动失败时尝试的驱动路径"""
+        return [self.driver_path] if self.driver_path else []
+
+    def block_requests(self, driver) -> bool:
+        """在导航前屏蔽 `blocked_urls` 中的请求，不支持时返回 False"""
+        return False
+
+    def open_isolated_tab(self, driver) -> Optional[str]:
+        """在独立的浏览器上下文（存储互不共享）中打开空白标签页，返回上下文 ID，不支持时返回 None"""
+        return None
+
+    def close_isolated_context(self, driver, context_id: str):
+        """释放 open_isolated_tab 创建的浏览器上下文"""
+
+    def launch(self):
+        """启动浏览器，全部方式失败时抛出最后一次的异常"""
+        from selenium.common.exceptions import WebDriverException
+
+        options = self.build_options()
+        driver = None
+        try:
+            driver = self.create(options)
+        except WebDriverException as e:
+            error = e
+            for path in self.driver_paths():
+                if os.path.exists(path):
+                    try:
+                        driver = self.create(options, path)
+                        print(f"✓ 使用驱动路径: {path}")
+                        break
+                    except Exception as e:
+                        error = e
+        if driver is None:
+            raise error
+
+        if self.blocked_urls:
+            if self.block_requests(driver):
+                print(f"✓ 已屏蔽 {len(self.blocked_urls)} 类无关请求")
+            else:
+                print(f"{self.display_name} 不支持请求屏蔽，跳过")
+        return driver
+
+
+class ChromiumFamilyBackend(DriverBackend):
+    """基于 Chromium 内核的浏览器（Chrome / Chromium / Edge）"""
+
+    # selenium.webdriver 中的选项类名
+    options_class = "ChromeOptions"
+    binary_candidates: List[str] = []
+
+    def find_binary(self) -> str:
+        if self.binary:
+            return self.binary
+        for candidate in self.binary_candidates:
+            path = shutil.which(candidate) or (candidate if os.path.isabs(candidate) and os.path.exists(candidate) else "")
+            if path:
+                return path
+        return ""
+
+    def build_options(self):
+        options = getattr(webdriver, self.options_class)()
+        binary = self.find_binary()
+        if binary:
+            options.binary_location = binary
+
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
+            # 不加载图片，降低内存与带宽占用
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+        else:
+            options.add_argument("--start-maximized")
+
+        for argument in (
+            "--disable-blink-features=AutomationControlled",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-infobars",
+            "--disable-notifications",
+            "--disable-popup-blocking",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--no-first-run",
+            "--mute-audio",
+            "--log-level=3",
+            "--silent",
+            f"--user-agent={USER_AGENT}",
+        ):
+            options.add_argument(argument)
+
+        options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+        options.add_experimental_option("useAutomationExtension", False)
+        # DOMContentLoaded 后即返回，不再等待广告等子资源
+        options.page_load_strategy = "eager"
+        return options
+
+    def open_isolated_tab(self, driver) -> Optional[str]:
+        try:
+            context = driver.execute_cdp_cmd("Target.createBrowserContext", {"disposeOnDetach": True})
+            context_id = context["browserContextId"]
+            driver.execute_cdp_cmd(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+            )
+            return context_id
+        except Exception as e:
+            print(f"创建独立浏览器上下文失败: {e}")
+            return None
+
+    def close_isolated_context(self, driver, context_id: str):
+        try:
+            driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+        except Exception:
+            pass
+
+    def block_requests(self, driver) -> bool:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls})
+            return True
+        except Exception as e:
+            print(f"请求屏蔽设置失败: {e}")
+            return False
+
+
+class ChromeBackend(ChromiumFamilyBackend):
+    name = "chrome"
+    display_name = "Chrome"
+    binary_candidates = ["google-chrome", "google-chrome-stable"]
+
+    def create(self, options, driver_path: Optional[str] = None):
+        if driver_path:
+            from selenium.webdriver.chrome.service import Service
+
+            return webdriver.Chrome(service=Service(executable_path=driver_path), options=options)
+        return webdriver.Chrome(options=options)
+
+    def driver_paths(self) -> List[str]:
+        return super().driver_paths() + ["/usr/bin/chromedriver", "/usr/local/bin/chromedriver"]
+
+
+class ChromiumBackend(ChromeBackend):
+    name = "chromium"
+    display_name = "Chromium"
+    binary_candidates = ["chromium", "chromium-browser", "/snap/bin/chromium"]
+
+    def driver_paths(self) -> List[str]:
+        return super().driver_paths() + ["/usr/lib/chromium/chromedriver", "/usr/lib/chromium-browser/chromedriver"]
+
+
+class EdgeBackend(ChromiumFamilyBackend):
+    name = "edge"
+    display_name = "Edge"
+    options_class = "EdgeOptions"
+    binary_candidates = ["microsoft-edge", "microsoft-edge-stable"]
+
+    def build_options(self):
+        options = super().build_options()
+        options.use_chromium = True
+        return options
+
+    def create(self, options, driver_path: Optional[str] = None):
+        if driver_path:
+            from selenium.webdriver.edge.service import Service
+
+            return webdriver.Edge(service=Service(executable_path=driver_path), options=options)
+        return webdriver.Edge(options=options)
+
+    def driver_paths(self) -> List[str]:
+        # 常见的 Windows Edge 驱动路径
+        return super().driver_paths() + [
+            r"C:\Program Files (x86)\Microsoft\Edge\Application\msedgedriver.exe",
+            r"C:\Program Files\Microsoft\Edge\Application\msedgedriver.exe",
+            os.path.expanduser(r"~\AppData\Local\Microsoft\Edge\Application\msedgedriver.exe"),
+            r"C:\Windows\System32\msedgedriver.exe",
+            "/usr/bin/msedgedriver",
+            "/usr/local/bin/msedgedriver",
+        ]
+
+
+class FirefoxBackend(DriverBackend):
+    name = "firefox"
+    display_name = "Firefox"
+
+    def build_options(self):
+        options = webdriver.FirefoxOptions()
+        if self.binary:
+            options.binary_location = self.binary
+        if self.headless:
+            options.add_argument("-headless")
+            options.add_argument(f"--width={WINDOW_SIZE[0]}")
+            options.add_argument(f"--height={WINDOW_SIZE[1]}")
+            options.set_preference("permissions.default.image", 2)
+        for key, value in {
+            "general.useragent.override": USER_AGENT,
+            "dom.webdriver.enabled": False,
+            "dom.webnotifications.enabled": False,
+            "media.autoplay.default": 5,
+            "app.update.enabled": False,
+            "browser.shell.checkDefaultBrowser": False,
+            "datareporting.policy.dataSubmissionEnabled": False,
+            "toolkit.telemetry.enabled": False,
+        }.items():
+            options.set_preference(key, value)
+        options.page_load_strategy = "eager"
+        return options
+
+    def create(self, options, driver_path: Optional[str] = None):
+        if driver_path:
+            from selenium.webdriver.firefox.service import Service
+
+            return webdriver.Firefox(service=Service(executable_path=driver_path), options=options)
+        return webdriver.Firefox(options=options)
+
+    def driver_paths(self) -> List[str]:
+        return super().driver_paths() + ["/usr/bin/geckodriver", "/usr/local/bin/geckodriver"]
+
+
+BACKENDS: Dict[str, Type[DriverBackend]] = {
+    backend.name: backend
+    for backend in (EdgeBackend, ChromeBackend, ChromiumBackend, FirefoxBackend)
+}
+
+
+def get_backend(
+    name: str,
+    headless: bool = True,
+    binary: str = "",
+    driver_path: str = "",
+    blocked_urls: Optional[List[str]] = None,
+) -> DriverBackend:
+    """按名称获取浏览器后端"""
+    try:
+        backend_class = BACKENDS[name.lower()]
+    except KeyError:
+        raise ValueError(f"不支持的浏览器: {name}，可选: {', '.join(BACKENDS)}") from None
+    return backend_class(
+        headless=headless, binary=binary, driver_path=driver_path, blocked_urls=blocked_urls
+    )
+
+
+class SharedBrowser:
+    """多局游戏共用的浏览器进程，每局游戏占用一个标签页
+
+    selenium 会话同一时刻只能操作一个标签页，各局游戏在操作页面前通过 `use` 获取锁并切换到
+    自己的标签页，等待动画或反馈时释放锁，从而在多个线程间协作调度。
+    Chromium 内核浏览器的标签页位于独立的浏览器上下文中，localStorage 与 Cookie 互不共享。
+    """
+
+    def __init__(self, backend: DriverBackend):
+        self.backend = backend
+        self.driver = None
+        self.lock = threading.RLock()
+        self.current: Optional[str] = None
+        self.anchor: Optional[str] = None
+        self.contexts: Dict[str, str] = {}
+
+    def start(self):
+        self.driver = self.backend.launch()
+        self.anchor = self.current = self.driver.current_window_handle
+        return self.driver
+
+    def open_tab(self) -> str:
+        """打开一个新标签页并返回其句柄"""
+        with self.lock:
+            before = set(self.driver.window_handles)
+            handle = None
+            context_id = self.backend.open_isolated_tab(self.driver)
+            if context_id is not None:
+                opened = set(self.driver.window_handles) - before
+                if opened:
+                    handle = opened.pop()
+                    self.contexts[handle] = context_id
+                    self.driver.switch_to.window(handle)
+                else:
+                    # 驱动未暴露该上下文中的标签页，退回普通标签页
+                    self.backend.close_isolated_context(self.driver, context_id)
+            if handle is None:
+                self.driver.switch_to.new_window("tab")
+                handle = self.driver.current_window_handle
+            self.current = handle
+            # 请求屏蔽按标签页生效，需要在每个新标签页中重新设置
+            if self.backend.blocked_urls:
+                self.backend.block_requests(self.driver)
+            return handle
+
+    def close_tab(self, handle: str):
+        with self.lock:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception:
+                pass
+            context_id = self.contexts.pop(handle, None)
+            if context_id:
+                self.backend.close_isolated_context(self.driver, context_id)
+            self.driver.switch_to.window(self.anchor)
+            self.current = self.anchor
+
+    @contextmanager
+    def use(self, handle: str) -> Iterator:
+        """独占浏览器并切换到指定标签页"""
+        with self.lock:
+            if self.current != handle:
+                self.driver.switch_to.window(handle)
+                self.current = handle
+            yield self.driver
+
+    def quit(self):
+        with self.lock:
+            if self.driver:
+                self.driver.quit()
+                self.driver = None
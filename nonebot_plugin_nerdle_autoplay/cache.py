@@ -0,0 +1,287 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+from nonebot.log import logger
+from nonebot.utils import run_sync
+
+from .clock import PuzzleClock
+from .config import plugin_config
+from .data_source import GameHistory
+from .metrics import CACHE_HITS, CACHE_MISSES
+
+# 缓存目录
+CACHE_DIR = Path(__file__).parent / "cache"
+CACHE_DIR.mkdir(exist_ok=True)
+
+# 每日预热结果使用的共享缓存标识，各会话无自身缓存时使用
+SHARED_CACHE_ID = "nerdle-shared"
+
+# 题目时钟，缓存键由题号计算
+clock = PuzzleClock(
+    timezone=plugin_config.nerdle_timezone,
+    rollover=plugin_config.nerdle_rollover_time,
+    epoch=plugin_config.nerdle_epoch_date,
+    guard_minutes=plugin_config.nerdle_no_cache_minutes,
+)
+
+def cache_id(user_id: str, variant: str = "classic") -> str:
+    """缓存标识：经典模式沿用用户ID，其余模式追加模式名"""
+    return user_id if variant == "classic" else f"{user_id}_{variant}"
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class LRUCache(Generic[K, V]):
+    """线程安全的 LRU 缓存"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.data: OrderedDict[K, V] = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def get(self, key: K) -> Optional[V]:
+        with self.lock:
+            if key not in self.data:
+                return None
+            self.data.move_to_end(key)
+            return self.data[key]
+    
+    def put(self, key: K, value: V):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+    
+    def pop(self, key: K):
+        with self.lock:
+            self.data.pop(key, None)
+    
+    def discard_if(self, predicate: Callable[[K], bool]):
+        """删除键满足条件的条目"""
+        with self.lock:
+            for key in [key for key in self.data if predicate(key)]:
+                del self.data[key]
+    
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+    
+    def __len__(self) -> int:
+        return len(self.data)
+
+# 内存缓存：(缓存标识, 题号) -> 游戏记录；各步 (猜测, 反馈编码) -> 最终结果 PNG
+history_cache: LRUCache[tuple[str, int], GameHistory] = LRUCache(
+    plugin_config.nerdle_memory_cache_size
+)
+image_cache: LRUCache[tuple[tuple[str, str], ...], bytes] = LRUCache(
+    plugin_config.nerdle_memory_cache_size
+)
+# 内存缓存对应的题号，题目切换时整体失效
+cached_puzzle_number = clock.puzzle_number()
+
+def check_rollover() -> int:
+    """返回当前题号，题目已切换时清空内存缓存"""
+    global cached_puzzle_number
+    number = clock.puzzle_number()
+    if number != cached_puzzle_number:
+        history_cache.clear()
+        image_cache.clear()
+        cached_puzzle_number = number
+    return number
+
+# 每个缓存键一把锁，避免同一会话的并发读写互相覆盖或误删
+key_locks: dict[str, threading.Lock] = {}
+key_locks_guard = threading.Lock()
+
+def get_key_lock(user_id: str) -> threading.Lock:
+    with key_locks_guard:
+        if user_id not in key_locks:
+            key_locks[user_id] = threading.Lock()
+        return key_locks[user_id]
+
+def write_atomic(path: Path, content: str):
+    """先写入同目录的临时文件再重命名，崩溃时不会留下半个文件"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def get_cache_file(user_id: str, puzzle_number: int | None = None) -> Path:
+    """获取用户缓存文件路径（按题号区分）"""
+    if puzzle_number is None:
+        puzzle_number = clock.puzzle_number()
+    # 格式：用户ID_题号.json
+    return CACHE_DIR / f"{user_id}_{puzzle_number}.json"
+
+def is_cache_valid(cache_file: Path) -> bool:
+    """检查缓存是否属于当前题目"""
+    # 旧格式（用户ID_年月日_时分.json）的题号部分无法解析，一律视为过期
+    number = cache_file.stem.rsplit("_", 1)[-1]
+    return number.isdigit() and int(number) == clock.puzzle_number()
+
+def load_cached_result(user_id: str) -> GameHistory | None:
+    """加载缓存结果（先查内存，再查磁盘）"""
+    number = check_rollover()
+    history = history_cache.get((user_id, number))
+    if history is not None:
+        CACHE_HITS.inc(layer="memory")
+        return history
+    
+    cache_file = get_cache_file(user_id, number)
+    with get_key_lock(user_id):
+        if not cache_file.exists():
+            CACHE_MISSES.inc()
+            return None
+        
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                history = GameHistory.from_dict(data)
+                logger.info(f"加载缓存: {cache_file.name}")
+                CACHE_HITS.inc(layer="disk")
+                history_cache.put((user_id, number), history)
+                return history
+        except Exception as e:
+            logger.error(f"加载缓存文件失败: {e}")
+            # 如果加载失败，删除损坏的缓存文件
+            try:
+                cache_file.unlink()
+            except:
+                pass
+            CACHE_MISSES.inc()
+            return None
+
+def save_cached_result(user_id: str, history: GameHistory):
+    """保存缓存结果（题目切换前后的窗口内不保存）"""
+    now = clock.now()
+    
+    if clock.in_guard_window(now):
+        logger.info(f"当前时间 {now:%H:%M} 临近题目切换，不保存缓存")
+        return
+    
+    try:
+        number = clock.puzzle_number(now)
+        cache_file = get_cache_file(user_id, number)
+        with get_key_lock(user_id):
+            write_atomic(cache_file, history.dumps())
+            history_cache.put((user_id, number), history)
+        logger.info(f"保存缓存: {cache_file.name}")
+    except Exception as e:
+        logger.error(f"保存缓存失败: {e}")
+
+def clean_old_caches():
+    """压缩缓存目录：清理不属于当前题目的缓存文件与写入中断残留的临时文件"""
+    check_rollover()
+    try:
+        cache_files = list(CACHE_DIR.glob("*.json"))
+        deleted_count = 0
+        
+        for cache_file in cache_files:
+            if not is_cache_valid(cache_file):
+                try:
+                    cache_file.unlink()
+                    deleted_count += 1
+                    logger.info(f"清理过期缓存: {cache_file.name}")
+                except Exception as e:
+                    logger.error(f"清理缓存失败: {e}")
+        
+        # 超过 10 分钟的临时文件说明写入进程已中断
+        expire = time.time() - 600
+        for tmp_file in CACHE_DIR.glob(".*.tmp"):
+            try:
+                if tmp_file.stat().st_mtime < expire:
+                    tmp_file.unlink()
+                    deleted_count += 1
+            except OSError as e:
+                logger.error(f"清理临时文件失败: {e}")
+        
+        if deleted_count > 0:
+            logger.info(f"共清理 {deleted_count} 个过期缓存文件")
+    except Exception as e:
+        logger.error(f"清理缓存时出错: {e}")
+
+def clear_caches(user_id: str | None = None) -> int:
+    """删除指定用户（为空时为全部，含各游戏模式）的缓存文件并使内存缓存失效，返回删除的文件数"""
+    pattern = f"{user_id}_*.json" if user_id else "*.json"
+    deleted_count = 0
+    for cache_file in CACHE_DIR.glob(pattern):
+        owner = cache_file.stem.rsplit("_", 1)[0]
+        with get_key_lock(owner):
+            try:
+                cache_file.unlink()
+                deleted_count += 1
+                logger.info(f"删除缓存: {cache_file.name}")
+            except Exception as e:
+                logger.error(f"删除缓存失败: {e}")
+    
+    if user_id:
+        history_cache.discard_if(
+            lambda key: key[0] == user_id or key[0].startswith(f"{user_id}_")
+        )
+    else:
+        history_cache.clear()
+        image_cache.clear()
+    return deleted_count
+
+def image_key(history: GameHistory) -> tuple[tuple[str, str], ...]:
+    """最终结果图片只由各步的猜测与反馈决定，以此为键
+
+    同一分钟内解出同一题的会话步骤可能不同（求解模式不同、某行未能读取），不能只按时间与答案区分。
+    """
+    return tuple((step.guess, step.pattern) for step in history.steps)
+
+def render_final_png(history: GameHistory) -> bytes:
+    """渲染最终结果图片，已预先渲染过时直接返回"""
+    key = image_key(history)
+    image = image_cache.get(key)
+    if image is None:
+        image = history.render_final_image().getvalue()
+        image_cache.put(key, image)
+    return image
+
+# 异步接口：所有磁盘操作都在线程池中执行，不阻塞事件循环
+
+async def aload_cached_result(user_id: str) -> GameHistory | None:
+    """异步加载缓存结果，内存命中时不切换线程"""
+    history = history_cache.get((user_id, check_rollover()))
+    if history is not None:
+        CACHE_HITS.inc(layer="memory")
+        return history
+    return await run_sync(load_cached_result)(user_id)
+
+async def asave_cached_result(user_id: str, history: GameHistory):
+    """异步保存缓存结果"""
+    await run_sync(save_cached_result)(user_id, history)
+
+async def aclear_caches(user_id: str | None = None) -> int:
+    """异步删除缓存，整批删除在同一次线程调用中完成"""
+    return await run_sync(clear_caches)(user_id)
+
+async def aclean_old_caches():
+    """异步清理过期缓存"""
+    await run_sync(clean_old_caches)()
+
+async def arender_final_png(history: GameHistory) -> bytes:
+    """异步渲染最终结果图片，内存命中时不切换线程"""
+    image = image_cache.get(image_key(history))
+    if image is not None:
+        return image
+    return await run_sync(render_final_png)(history)
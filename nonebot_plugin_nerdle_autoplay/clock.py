@@ -0,0 +1,74 @@
+from datetime import date, datetime, time, timedelta, timezone as fixed_timezone, tzinfo
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from nonebot.log import logger
+
+# 找不到时区数据库时（如未安装 tzdata 的 Windows）使用的固定时区：北京时间，与默认时区一致
+FALLBACK_TZ = fixed_timezone(timedelta(hours=8), "UTC+08:00")
+
+
+def load_timezone(name: str) -> tzinfo:
+    """加载时区，时区数据不可用时回退到固定的 UTC+8"""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"无法加载时区 {name}（可安装 tzdata），改用固定的 UTC+8")
+        return FALLBACK_TZ
+
+
+class PuzzleClock:
+    """每日题目的时钟模型
+
+    题目在指定时区的 `rollover` 时刻切换，`epoch` 为第 1 题的日期，
+    任意时刻都可以直接换算出当前的题号，缓存键由题号计算得到。
+    """
+
+    def __init__(
+        self,
+        timezone: str = "Asia/Shanghai",
+        rollover: time = time(8, 0),
+        epoch: date = date(2022, 1, 20),
+        guard_minutes: int = 5,
+    ):
+        self.tz: tzinfo = load_timezone(timezone)
+        self.rollover = rollover
+        self.epoch = epoch
+        self.guard = timedelta(minutes=guard_minutes)
+
+    def now(self) -> datetime:
+        return datetime.now(self.tz)
+
+    def _localize(self, moment: Optional[datetime]) -> datetime:
+        if moment is None:
+            return self.now()
+        if moment.tzinfo is None:
+            # 无时区信息的时间按本机时区解释
+            moment = moment.astimezone()
+        return moment.astimezone(self.tz)
+
+    def puzzle_date(self, moment: Optional[datetime] = None) -> date:
+        """时刻所属题目的日期"""
+        moment = self._localize(moment)
+        if moment.time() < self.rollover:
+            return moment.date() - timedelta(days=1)
+        return moment.date()
+
+    def puzzle_number(self, moment: Optional[datetime] = None) -> int:
+        """时刻所属题目的题号（第 1 题为 epoch 当天）"""
+        return (self.puzzle_date(moment) - self.epoch).days + 1
+
+    def rollover_at(self, puzzle_date: date) -> datetime:
+        """某日题目开始的时刻"""
+        return datetime.combine(puzzle_date, self.rollover, tzinfo=self.tz)
+
+    def next_rollover(self, moment: Optional[datetime] = None) -> datetime:
+        """下一次切换题目的时刻"""
+        moment = self._localize(moment)
+        return self.rollover_at(self.puzzle_date(moment) + timedelta(days=1))
+
+    def in_guard_window(self, moment: Optional[datetime] = None) -> bool:
+        """是否处于切换前后的不缓存窗口内"""
+        moment = self._localize(moment)
+        current = self.rollover_at(self.puzzle_date(moment))
+        return moment - current <= self.guard or self.next_rollover(moment) - moment <= self.guard
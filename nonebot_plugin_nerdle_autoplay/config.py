@@ -0,0 +1,79 @@
+from datetime import date, time
+from typing import Dict, List, Literal
+
+from nonebot import get_plugin_config
+from nonebot.log import logger
+from pydantic import BaseModel
+
+
+class Config(BaseModel):
+    """插件配置"""
+
+    # 消息节奏模式：normal 为逐条演示，compact 将文字与图片合并为一条消息
+    nerdle_pacing_mode: Literal["normal", "compact"] = "normal"
+    # 演示各阶段的间隔（秒）
+    nerdle_intro_interval: float = 1.0
+    nerdle_step_text_interval: float = 2.0
+    nerdle_step_image_interval: float = 3.0
+    # 全局令牌桶：所有会话共享的发送速率（条/秒）与突发容量，速率 <= 0 表示不限制
+    nerdle_global_rate: float = 0.0
+    nerdle_global_burst: int = 5
+    # 按适配器名称限制发送速率（条/秒），如 {"OneBot V11": 1.0}
+    nerdle_adapter_rate_limits: Dict[str, float] = {}
+    # 指标暴露地址（挂载在 NoneBot 驱动器的 ASGI 应用上），默认留空不暴露；该地址没有鉴权，需自行限制访问
+    nerdle_metrics_path: str = ""
+    # 是否对求解与渲染热点函数进行性能分析，也可由超级管理员命令临时开关
+    nerdle_profiling: bool = False
+    # 保留的性能分析文件数量
+    nerdle_profile_keep: int = 20
+    # 每日预热：在题目切换后自动游玩一次并写入共享缓存
+    nerdle_prewarm_enabled: bool = True
+    # 预热时间相对题目切换时刻的延迟（分钟），需晚于不缓存窗口
+    nerdle_prewarm_delay_minutes: int = 6
+    # 预热失败后的重试次数与首次重试等待时间（秒，之后每次翻倍）
+    nerdle_prewarm_retries: int = 3
+    nerdle_prewarm_backoff: float = 60.0
+    # 题目切换模型：所在时区、每日切换时刻、第 1 题的日期，以及切换前后不写缓存的分钟数
+    nerdle_timezone: str = "Asia/Shanghai"
+    nerdle_rollover_time: time = time(8, 0)
+    nerdle_epoch_date: date = date(2022, 1, 20)
+    nerdle_no_cache_minutes: int = 5
+    # 内存中保留的游戏记录与结果图片数量（LRU），0 表示不使用内存缓存
+    nerdle_memory_cache_size: int = 128
+    # 定期压缩缓存目录的间隔（分钟）
+    nerdle_cache_compact_interval: int = 60
+    # 同时进行的浏览器游戏上限，以及排队等待的请求上限（超出时直接拒绝）
+    nerdle_max_concurrent_games: int = 1
+    nerdle_max_queue: int = 5
+    # 浏览器后端：edge / chrome / chromium / firefox，以及是否以无头模式运行
+    nerdle_browser: Literal["edge", "chrome", "chromium", "firefox"] = "edge"
+    nerdle_headless: bool = True
+    # 浏览器可执行文件与驱动路径，留空时自动查找
+    nerdle_browser_binary: str = ""
+    nerdle_driver_path: str = ""
+    # 导航前屏蔽广告、统计、字体与图片请求（仅 Chromium 内核浏览器），以及额外屏蔽的地址模式
+    nerdle_block_resources: bool = True
+    nerdle_blocked_urls: List[str] = []
+    # 第一次猜测后尝试从页面 localStorage 读取答案，成功时余下回合在本地求解，失败时自动回退
+    nerdle_state_fast_path: bool = False
+    # 每日预热的游戏模式，多个模式在同一浏览器的不同标签页中同时进行
+    nerdle_prewarm_variants: List[Literal["classic", "midi", "mini"]] = ["classic"]
+    # 保存并在启动时恢复站点 Cookie 与精简后的 localStorage，跳过同意与引导弹窗；快照有效天数
+    nerdle_session_snapshot: bool = True
+    nerdle_snapshot_max_age_days: int = 7
+    # 默认求解模式：hard 只猜剩余候选（符合困难模式）；free 可用整个词典中的等式探测；
+    # hybrid 候选多于阈值时探测，之后只猜候选。可在命令中按次指定
+    nerdle_solver_mode: Literal["hard", "free", "hybrid"] = "hybrid"
+    nerdle_hybrid_threshold: int = 8
+
+
+plugin_config = get_plugin_config(Config)
+
+# 预热需晚于切换后的不缓存窗口，否则预热结果不会写入缓存
+if plugin_config.nerdle_prewarm_delay_minutes <= plugin_config.nerdle_no_cache_minutes:
+    logger.warning(
+        f"NERDLE_PREWARM_DELAY_MINUTES（{plugin_config.nerdle_prewarm_delay_minutes}）"
+        f"需大于 NERDLE_NO_CACHE_MINUTES（{plugin_config.nerdle_no_cache_minutes}），"
+        f"已改为 {plugin_config.nerdle_no_cache_minutes + 1}"
+    )
+    plugin_config.nerdle_prewarm_delay_minutes = plugin_config.nerdle_no_cache_minutes + 1
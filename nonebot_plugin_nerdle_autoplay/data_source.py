@@ -1,28 +1,58 @@
 # 渲染部分基本同 nonebot_plugin_nerdle 的 data_source.py，AutoPlayer 部分由 click_nerdle.py 重构而来
 from enum import Enum
 from io import BytesIO
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Callable, Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from dataclasses import dataclass, field
+from functools import lru_cache
 import time
 import json
 import traceback
 import os
+import base64
+import binascii
 
-from PIL import Image, ImageDraw, ImageFont
-from PIL.Image import Image as IMG
-from selenium import webdriver
-from selenium.webdriver.edge.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import (
-    StaleElementReferenceException,
-    TimeoutException,
-    NoSuchElementException,
-    WebDriverException
+from .browser import BLOCKED_URL_PATTERNS, DriverBackend, SharedBrowser, get_backend
+from .lazy import LazyImport
+from .metrics import BROWSER_LAUNCH_FAILURES, FEEDBACK_FALLBACKS, RENDER_SECONDS, STATE_FAST_PATH
+from .profiling import profiled
+from .snapshot import LOCAL_STORAGE_SCRIPT, SessionSnapshot, cache_busted
+from .solver import (
+    CODE_TO_STATUS,
+    SOLVER_MODES,
+    UNKNOWN_CODE,
+    CandidateSet,
+    ConstraintIndex,
+    TreeNode,
+    best_probe_guess,
+    feedback_pattern,
+    filter_candidates_by_feedback,
+    load_decision_tree,
+    load_dictionary,
+    nerdle_feedback,
+    pack_feedback,
+    safe_find_elements,
+    suggest_next_guess,
+    tree_child,
+    tree_guess,
+    unpack_feedback,
 )
+from .timing import record_span
+
+if TYPE_CHECKING:
+    from PIL.Image import Image as IMG
+
+# Pillow 与 selenium 导入较慢，首次渲染 / 启动浏览器时才导入，加快插件加载
+# （selenium 的异常类在用到它们的方法内导入）
+Image = LazyImport("PIL.Image")
+ImageDraw = LazyImport("PIL.ImageDraw")
+ImageFont = LazyImport("PIL.ImageFont")
+By = LazyImport("selenium.webdriver.common.by", "By")
+Keys = LazyImport("selenium.webdriver.common.keys", "Keys")
+WebDriverWait = LazyImport("selenium.webdriver.support.ui", "WebDriverWait")
+EC = LazyImport("selenium.webdriver.support.expected_conditions")
+ActionChains = LazyImport("selenium.webdriver.common.action_chains", "ActionChains")
 
 # 常量定义
 BLOCK_SIZE = (40, 40)
@@ -30,6 +60,7 @@ BLOCK_PADDING = (10, 10)
 PADDING = (20, 20)
 BORDER_WIDTH = 2
 FONT_SIZE = 20
+MAX_ATTEMPTS = 6  # 每局最多尝试次数（各变体相同）
 
 # 颜色定义
 CORRECT_COLOR = (134, 163, 115)  # 绿色
@@ -41,64 +72,90 @@ FONT_COLOR = (255, 255, 255)     # 文字颜色
 UNGUESSED_COLOR = (255, 255, 255)  # 未猜测字符的背景颜色（白色）
 UNGUESSED_FONT_COLOR = (123, 123, 124)  # 未猜测字符的字体颜色（灰色）
 
-@dataclass
+# 缓存格式版本：1 为逐字符反馈的缩进 JSON，2 为紧凑编码
+HISTORY_FORMAT_VERSION = 2
+
+
+@dataclass(slots=True)
 class GameStep:
     """游戏步骤"""
     guess: str
-    feedback: List[Dict[str, str]]  # 每个字符的反馈
+    pattern: str  # 每个字符的反馈编码（0=absent, 1=present, 2=correct, ?=未能读取）
     candidate_count: int  # 剩余候选数量
     next_suggestion: str  # 下一个建议
+    timings: Dict[str, float] = field(default_factory=dict)  # 本回合各阶段耗时（秒）
     
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "guess": self.guess,
-            "feedback": self.feedback,
-            "candidate_count": self.candidate_count,
-            "next_suggestion": self.next_suggestion
-        }
+    @property
+    def feedback(self) -> List[Dict[str, str]]:
+        """逐字符反馈（兼容旧接口）"""
+        return unpack_feedback(self.guess, self.pattern)
+    
+    def to_list(self) -> List[Any]:
+        data = [self.guess, self.pattern, self.candidate_count, self.next_suggestion]
+        if self.timings:
+            data.append(self.timings)
+        return data
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'GameStep':
-        return cls(
-            guess=data["guess"],
-            feedback=data["feedback"],
-            candidate_count=data["candidate_count"],
-            next_suggestion=data["next_suggestion"]
-        )
+    def from_data(cls, data: Any) -> 'GameStep':
+        """读取紧凑格式或旧版逐字符反馈格式"""
+        if isinstance(data, dict):
+            return cls(
+                guess=data["guess"],
+                pattern=pack_feedback(data["feedback"], strict=False),
+                candidate_count=data["candidate_count"],
+                next_suggestion=data["next_suggestion"],
+                timings=data.get("timings", {})
+            )
+        guess, pattern, candidate_count, next_suggestion, *rest = data
+        return cls(guess, pattern, candidate_count, next_suggestion, rest[0] if rest else {})
 
 
-@dataclass
+@dataclass(slots=True)
 class GameHistory:
     """游戏历史记录"""
     answer: str
     steps: List[GameStep] = field(default_factory=list)
     date: str = ""
     cached_time: str = ""  # 新增：缓存时间（精确到分钟）
+    timings: Dict[str, float] = field(default_factory=dict)  # 整局各阶段耗时（秒）
     
     def __post_init__(self):
-        self.step_char_status_history = []  # 记录每一步的字符状态历史
         # 如果没有设置缓存时间，使用当前时间
         if not self.cached_time:
             self.cached_time = time.strftime("%Y-%m-%d %H:%M")
     
+    @property
+    def solved(self) -> bool:
+        """最后一步全部正确（未解出时 answer 只是推测的候选）"""
+        return bool(self.steps) and self.steps[-1].pattern == "2" * len(self.steps[-1].guess)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
+            "v": HISTORY_FORMAT_VERSION,
             "answer": self.answer,
-            "steps": [step.to_dict() for step in self.steps],
+            "steps": [step.to_list() for step in self.steps],
             "date": self.date or time.strftime("%Y-%m-%d"),
-            "cached_time": self.cached_time  # 保存缓存时间
+            "cached_time": self.cached_time,  # 保存缓存时间
+            "timings": self.timings
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'GameHistory':
-        history = cls(
+        if data.get("v", 1) > HISTORY_FORMAT_VERSION:
+            raise ValueError(f"不支持的缓存格式版本: {data['v']}")
+        return cls(
             answer=data["answer"],
-            steps=[GameStep.from_dict(step) for step in data["steps"]],
-            date=data.get("date", "")
+            steps=[GameStep.from_data(step) for step in data["steps"]],
+            date=data.get("date", ""),
+            # 设置缓存时间
+            cached_time=data.get("cached_time", ""),
+            timings=data.get("timings", {})
         )
-        # 设置缓存时间
-        history.cached_time = data.get("cached_time", time.strftime("%Y-%m-%d %H:%M"))
-        return history
+    
+    def dumps(self) -> str:
+        """序列化为紧凑 JSON"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
     
     def get_char_status_at_step(self, step_index: int) -> Dict[str, str]:
         """获取在特定步骤时的字符状态"""
@@ -115,14 +172,11 @@ class GameHistory:
                 break
                 
             step = self.steps[i]
-            guess = step.guess
-            feedback = step.feedback
             
             # 计算这次猜测中每个字符的状态
             guess_status = {}
-            for j, char in enumerate(guess):
-                fb = feedback[j]
-                guess_status[char] = fb["status"]
+            for char, code in zip(step.guess, step.pattern):
+                guess_status[char] = CODE_TO_STATUS.get(code, "unguessed")
             
             # 根据状态优先级更新字符状态
             # 优先级：correct > present > absent > unguessed
@@ -152,7 +206,7 @@ class GameHistory:
         return char_status
     
     def draw_block(self, color: tuple[int, int, int], char: str, 
-                   font: ImageFont.FreeTypeFont, font_color: tuple[int, int, int] = None) -> IMG:
+                   font: "ImageFont.FreeTypeFont", font_color: tuple[int, int, int] = None) -> "IMG":
         """绘制单个方块"""
         block = Image.new("RGB", BLOCK_SIZE, BORDER_COLOR)
         inner_w = BLOCK_SIZE[0] - BORDER_WIDTH * 2
@@ -170,13 +224,15 @@ class GameHistory:
             draw.text((x, y), char, font=font, fill=text_color)
         return block
     
+    @profiled
     def render_step_image(self, step_index: int) -> BytesIO:
         """渲染指定步骤时的图片（显示到该步骤为止的所有猜测）"""
         if not self.steps or step_index < 0:
             return self.render_final_image()
         
-        length = len(self.answer)
-        rows = length - 2  # 最大猜测次数
+        render_start = time.perf_counter()
+        length = len(self.steps[0].guess)  # 游戏进行中答案可能尚未确定
+        rows = max(MAX_ATTEMPTS, len(self.steps))
         
         # 计算主游戏区域宽度
         main_board_w = length * BLOCK_SIZE[0]
@@ -223,18 +279,21 @@ class GameHistory:
         for row in range(rows):
             if row <= step_index and row < len(self.steps):
                 guessed_equation = self.steps[row].guess
-                feedback = self.steps[row].feedback
+                pattern = self.steps[row].pattern
                 
                 blocks: list[IMG] = []
                 for i in range(length):
                     char = guessed_equation[i]
-                    fb = feedback[i]
                     
                     # 根据反馈选择颜色
-                    if fb["status"] == "correct":
+                    if pattern[i] == "2":
                         color = CORRECT_COLOR
-                    elif fb["status"] == "present":
+                    elif pattern[i] == "1":
                         color = EXIST_COLOR
+                    elif pattern[i] == UNKNOWN_CODE:
+                        # 未能读取反馈，按未猜测的样式显示
+                        blocks.append(self.draw_block(UNGUESSED_COLOR, char, font, UNGUESSED_FONT_COLOR))
+                        continue
                     else:
                         color = WRONG_COLOR
                     
@@ -291,6 +350,7 @@ class GameHistory:
         board = board.convert("RGBA")
         board.save(output, format="png")
         output.seek(0)
+        RENDER_SECONDS.observe(time.perf_counter() - render_start)
         return output
     
     def render_final_image(self) -> BytesIO:
@@ -307,192 +367,237 @@ class GameHistory:
         return self.render_step_image(len(self.steps) - 1)
 
 
+@dataclass(frozen=True)
+class Variant:
+    """Nerdle 游戏模式"""
+    name: str
+    length: int  # 等式长度
+    url: str
+    first_guess: str  # 没有决策树时的首次猜测
+
+
+VARIANTS: Dict[str, Variant] = {
+    "classic": Variant("classic", 8, "https://nerdlegame.com/", "1+56/7=9"),
+    "midi": Variant("midi", 7, "https://nerdlegame.com/midi", "6+25=31"),
+    "mini": Variant("mini", 6, "https://nerdlegame.com/mini", "14-8=6"),
+}
+
+
+
+@dataclass(frozen=True)
+class Dictionary:
+    """某一长度的词典、约束索引与决策树，只读，由同一长度的所有玩家共享"""
+    equations: List[str]
+    index: ConstraintIndex
+    tree: Optional[TreeNode]
+
+
+@lru_cache(maxsize=None)
+def load_shared_dictionary(length: int) -> Dictionary:
+    """加载并缓存词典，每种长度只构建一次索引、解析一次决策树；加载失败时抛出异常（不缓存）"""
+    equations, metadata = load_dictionary(length)
+    
+    if metadata is not None:
+        # 元数据与词典文件一致，说明词典已由 build_nerdle_dictionary.py 离线校验
+        valid_equations = equations
+    else:
+        valid_equations = []
+        for eq in equations:
+            if isinstance(eq, str) and len(eq) == length:
+                valid_equations.append(eq)
+            else:
+                print(f"警告: 跳过无效等式: {eq}")
+    
+    index = ConstraintIndex(valid_equations, metadata)
+    print(f"✓ 从文件读取了 {len(valid_equations)} 个合法等式")
+    
+    # 加载离线构建的决策树（与词典不一致时忽略）
+    tree = load_decision_tree(valid_equations, metadata and metadata["dictionary"])
+    if tree is not None:
+        print("✓ 已加载决策树")
+    return Dictionary(valid_equations, index, tree)
+
+# 页面加载（eager 策略下为 DOMContentLoaded）与等待棋盘出现的超时时间（秒）
+PAGE_LOAD_TIMEOUT = 15
+BOARD_WAIT_TIMEOUT = 10
+# 棋盘行的选择器，与 get_feedback_from_page 中的行选择器一致
+BOARD_SELECTOR = 'div[id^="row"], div.row, div.game-row, div.guess-row'
+# 反馈校验失败时的最多读取次数与重读间隔（秒）
+FEEDBACK_READ_RETRIES = 4
+FEEDBACK_RETRY_DELAY = 0.5
+
+
+def _iter_state_strings(value: Any, length: int, depth: int = 0):
+    """遍历页面状态中可能是等式的字符串"""
+    if depth > 8:
+        return
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_state_strings(item, length, depth + 1)
+    elif isinstance(value, list):
+        if len(value) == length and all(isinstance(c, str) and len(c) == 1 for c in value):
+            yield "".join(value)
+        for item in value:
+            yield from _iter_state_strings(item, length, depth + 1)
+    elif isinstance(value, str):
+        text = value.strip()
+        if len(text) == length:
+            yield text
+        elif text[:1] in "[{":
+            try:
+                yield from _iter_state_strings(json.loads(text), length, depth + 1)
+            except ValueError:
+                pass
+        elif len(text) % 4 == 0 and 0 < len(text) <= 64:
+            try:
+                decoded = base64.b64decode(text, validate=True).decode("utf-8")
+            except (binascii.Error, UnicodeDecodeError):
+                return
+            if len(decoded) == length:
+                yield decoded
+
+
 class NerdleAutoPlayer:
     """Nerdle自动玩家 - 基于可运行代码重构"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        variant: str = "classic",
+        browser: str = "edge",
+        headless: bool = True,
+        browser_binary: str = "",
+        driver_path: str = "",
+        block_resources: bool = True,
+        extra_blocked_urls: Optional[List[str]] = None,
+        fast_path: bool = False,
+        session: Optional[SharedBrowser] = None,
+        snapshot: Optional[SessionSnapshot] = None,
+        mode: str = "hybrid",
+        hybrid_threshold: int = 8,
+    ):
+        if mode not in SOLVER_MODES:
+            raise ValueError(f"未知的求解模式: {mode}")
+        self.variant = VARIANTS[variant]
+        self.mode = mode
+        self.hybrid_threshold = hybrid_threshold
         self.driver = None
+        # 与其他游戏共用浏览器时为所在的会话与标签页
+        self.session = session
+        self.tab: Optional[str] = None
+        # 会话快照：启动时恢复以跳过同意与引导弹窗，成功完成后更新
+        self.snapshot = snapshot
+        self.browser = browser
+        self.headless = headless
+        self.browser_binary = browser_binary
+        self.driver_path = driver_path
+        self.fast_path = fast_path
+        self.blocked_urls = (
+            BLOCKED_URL_PATTERNS + list(extra_blocked_urls or []) if block_resources else []
+        )
         self.all_candidates = []
+        self.index = ConstraintIndex([])
+        self.tree = None
         self.load_equations()
     
     def load_equations(self):
-        """从文件加载等式"""
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        file_path = os.path.join(current_dir, "resources", "equals", "dic-8.json")
-        
+        """加载（共享的）词典、约束索引与决策树"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                equations = json.load(f)
-            
-            valid_equations = []
-            for eq in equations:
-                if isinstance(eq, str) and len(eq) == 8:
-                    valid_equations.append(eq)
-                else:
-                    print(f"警告: 跳过无效等式: {eq}")
-            
-            self.all_candidates = valid_equations
-            print(f"✓ 从文件读取了 {len(self.all_candidates)} 个合法等式")
+            dictionary = load_shared_dictionary(self.variant.length)
         except Exception as e:
             print(f"✗ 加载等式失败: {e}")
-            self.all_candidates = []
+            return
+        self.all_candidates = dictionary.equations
+        self.index = dictionary.index
+        self.tree = dictionary.tree
     
     def nerdle_feedback(self, answer: str, guess: str):
         """计算反馈"""
-        result = []
-        used = [False] * 8
-        
-        # correct
-        for i in range(8):
-            if guess[i] == answer[i]:
-                result.append({"char": guess[i], "status": "correct"})
-                used[i] = True
-            else:
-                result.append(None)
-        
-        # present / absent
-        for i in range(8):
-            if result[i] is not None:
-                continue
-            
-            found = False
-            for j in range(8):
-                if not used[j] and guess[i] == answer[j]:
-                    used[j] = True
-                    found = True
-                    break
-            
-            result[i] = {
-                "char": guess[i],
-                "status": "present" if found else "absent"
-            }
-        
-        return result
+        return nerdle_feedback(answer, guess)
     
+    @profiled
     def suggest_next_guess(self, candidates, history):
         """建议下一个猜测"""
-        if not candidates:
-            return None
-        
-        best_guess = None
-        max_unique_feedbacks = 0
-        
-        for guess_candidate in candidates:
-            all_feedbacks = []
-            
-            for answer_candidate in candidates:
-                feedback = self.nerdle_feedback(answer_candidate, guess_candidate)
-                feedback_tuple = tuple((item['char'], item['status']) for item in feedback)
-                all_feedbacks.append(feedback_tuple)
-            
-            unique_feedbacks = set(all_feedbacks)
-            unique_count = len(unique_feedbacks)
-            
-            if unique_count > max_unique_feedbacks:
-                max_unique_feedbacks = unique_count
-                best_guess = guess_candidate
-        
-        return best_guess if best_guess else candidates[0]
+        return suggest_next_guess(candidates, history)
+    
+    @profiled
+    def choose_guess(self, candidates: CandidateSet, history) -> str:
+        """按求解模式选择下一个猜测，`history` 为已完成的步骤，其中的猜测不会再被选择"""
+        if len(candidates) <= 1:
+            return candidates.first() or ""
+        if self.mode == "hard" or (
+            self.mode == "hybrid" and len(candidates) <= self.hybrid_threshold
+        ):
+            return self.suggest_next_guess(candidates.to_list(), history) or candidates.first()
+        return best_probe_guess(candidates, played={step.guess for step in history or []})
+    
+    def tree_allows(self, node, candidates: CandidateSet) -> bool:
+        """困难模式下决策树中的探测猜测不一定符合已知提示，此时不能使用"""
+        guess = tree_guess(node)
+        return bool(guess) and (self.mode != "hard" or guess in candidates)
     
+    @profiled
     def filter_candidates_by_feedback(self, candidates, guess, real_feedback):
         """根据反馈过滤候选"""
-        filtered = []
-        
-        for cand in candidates:
-            simulated = self.nerdle_feedback(cand, guess)
-            
-            ok = True
-            for i in range(8):
-                if simulated[i]["status"] != real_feedback[i]["status"]:
-                    ok = False
-                    break
-            
-            if ok:
-                filtered.append(cand)
-        
-        return filtered
+        return filter_candidates_by_feedback(candidates, guess, real_feedback)
+    
+    @profiled
+    def narrow_candidates(self, candidates: CandidateSet, guess: str, real_feedback) -> CandidateSet:
+        """根据反馈收窄候选集合（与 filter_candidates_by_feedback 结果一致）"""
+        return candidates.narrow(guess, real_feedback)
     
     def safe_find_elements(self, by, selector, retries=3):
         """安全地查找元素"""
-        for attempt in range(retries):
-            try:
-                return self.driver.find_elements(by, selector)
-            except StaleElementReferenceException:
-                if attempt < retries - 1:
-                    time.sleep(0.3)
-                    continue
-                raise
-        return []
+        return safe_find_elements(self.driver, by, selector, retries)
+    
+    def make_backend(self) -> DriverBackend:
+        """按配置创建浏览器后端"""
+        return get_backend(
+            self.browser,
+            headless=self.headless,
+            binary=self.browser_binary,
+            driver_path=self.driver_path,
+            blocked_urls=self.blocked_urls,
+        )
     
     def setup_driver(self):
-        """设置浏览器驱动 - Windows Edge优化版本"""
-        edge_options = Options()
-        
-        # Windows Edge特定设置
-        edge_options.use_chromium = True
-        edge_options.add_argument('--start-maximized')
-        edge_options.add_argument('--disable-blink-features=AutomationControlled')
-        edge_options.add_argument('--no-sandbox')
-        edge_options.add_argument('--disable-dev-shm-usage')
-        edge_options.add_argument('--disable-gpu')
-        edge_options.add_argument('--disable-extensions')
-        edge_options.add_argument('--disable-infobars')
-        edge_options.add_argument('--disable-notifications')
-        edge_options.add_argument('--disable-popup-blocking')
-        edge_options.add_argument('--log-level=3')
-        edge_options.add_argument('--silent')
-        
-        # 实验性选项
-        edge_options.add_experimental_option('excludeSwitches', [
-            'enable-automation',
-            'enable-logging'
-        ])
-        edge_options.add_experimental_option('useAutomationExtension', False)
-        
-        # 设置页面加载策略
-        edge_options.page_load_strategy = 'normal'
-        
-        # 添加用户代理
-        edge_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0')
-        
-        # 尝试启动浏览器
+        """按配置的浏览器后端启动驱动，共用浏览器时改为打开一个标签页"""
         try:
-            driver = webdriver.Edge(options=edge_options)
-            self.driver = driver
-            print("✓ Edge浏览器已启动")
+            if self.session:
+                self.tab = self.session.open_tab()
+                self.driver = self.session.driver
+                print(f"✓ 已打开 {self.variant.name} 标签页")
+                return True
+            backend = self.make_backend()
+            self.driver = backend.launch()
+            print(f"✓ {backend.display_name}浏览器已启动{'（无头模式）' if self.headless else ''}")
             return True
-        except WebDriverException:
-            # 尝试指定常见Edge驱动路径
-            common_paths = [
-                r"C:\Program Files (x86)\Microsoft\Edge\Application\msedgedriver.exe",
-                r"C:\Program Files\Microsoft\Edge\Application\msedgedriver.exe",
-                os.path.expanduser(r"~\AppData\Local\Microsoft\Edge\Application\msedgedriver.exe"),
-                r"C:\Windows\System32\msedgedriver.exe",
-            ]
-            
-            for path in common_paths:
-                if os.path.exists(path):
-                    try:
-                        from selenium.webdriver.edge.service import Service
-                        service = Service(executable_path=path)
-                        driver = webdriver.Edge(service=service, options=edge_options)
-                        self.driver = driver
-                        print(f"✓ Edge浏览器已启动（使用驱动路径: {path}）")
-                        return True
-                    except:
-                        continue
-            
-            print("✗ 无法启动Edge浏览器")
-            return False
         except Exception as e:
             print(f"✗ 启动浏览器失败: {e}")
+            BROWSER_LAUNCH_FAILURES.inc()
             return False
     
-    def get_feedback_from_page(self, attempt: int, user_input: str):
-        """从页面获取反馈 - 简化稳定版本"""
+    def page(self):
+        """操作页面前获取浏览器：共用浏览器时独占并切换到本局的标签页"""
+        if self.session and self.tab:
+            return self.session.use(self.tab)
+        return nullcontext(self.driver)
+    
+    def close_driver(self):
+        """关闭浏览器，共用浏览器时只关闭本局的标签页"""
+        if self.session:
+            if self.tab:
+                self.session.close_tab(self.tab)
+                self.tab = None
+            return
+        self.driver.quit()
+    
+    def get_feedback_from_page(self, attempt: int, user_input: str, wait: float = 1.5):
+        """从页面获取反馈 - 简化稳定版本，无法识别的单元格状态记为空串"""
+        from selenium.common.exceptions import StaleElementReferenceException
+        
         try:
             # 等待结果显示
-            time.sleep(1.5)
+            time.sleep(wait)
             
             # 尝试多种方式查找行
             rows = []
@@ -529,7 +634,7 @@ class NerdleAutoPlayer:
                 for selector in cell_selectors:
                     try:
                         cells = current_row.find_elements(By.CSS_SELECTOR, selector)
-                        if cells and len(cells) >= 8:
+                        if cells and len(cells) >= len(user_input):
                             break
                     except:
                         continue
@@ -566,10 +671,10 @@ class NerdleAutoPlayer:
                                     char = user_input[cell_index] if cell_index < len(user_input) else '?'
                                     result.append({"char": char, "status": "absent"})
                                 else:
-                                    # 默认状态
+                                    # 状态未知（可能动画尚未结束），交由校验后重读
                                     result.append({
                                         "char": user_input[cell_index] if cell_index < len(user_input) else '?', 
-                                        "status": "absent"
+                                        "status": ""
                                     })
                             
                             cell_index += 1
@@ -584,14 +689,11 @@ class NerdleAutoPlayer:
                         except IndexError:
                             break
                 
-                # 如果无法获取结果，使用模拟反馈
-                if not result and user_input:
-                    print("无法读取结果，使用模拟反馈...")
-                    # 使用简单模拟
-                    for i in range(8):
-                        result.append({"char": user_input[i], "status": "absent"})
+                if not result:
+                    print("无法读取结果")
+                    return None
                 
-                return result[:8]  # 确保只返回8个
+                return result[:len(user_input)]  # 确保只返回与猜测等长的结果
             else:
                 print(f"✗ 未找到第 {attempt + 1} 行")
                 return None
@@ -600,6 +702,66 @@ class NerdleAutoPlayer:
             print(f"✗ 读取结果失败: {e}")
             return None
     
+    def read_verified_feedback(self, attempt: int, guess: str, candidates: CandidateSet):
+        """读取反馈并与剩余候选交叉校验
+
+        反馈须完整、字符与猜测一致，且至少与一个剩余候选的模拟反馈相同
+        （以约束索引判断，与逐个调用 nerdle_feedback 比较等价）；
+        否则稍后重读，全部失败时返回 None。
+        """
+        for retry in range(FEEDBACK_READ_RETRIES):
+            # 等待期间不占用浏览器，共用浏览器的其他游戏可以继续操作
+            time.sleep(1.5 if retry == 0 else FEEDBACK_RETRY_DELAY)
+            with self.page():
+                feedback = self.get_feedback_from_page(attempt, guess, wait=0)
+            if not feedback or len(feedback) != len(guess):
+                reason = "反馈不完整"
+            elif any(fb["char"] not in (char, "?") for fb, char in zip(feedback, guess)):
+                reason = "反馈字符与猜测不一致"
+            elif not (pattern := pack_feedback(feedback)):
+                reason = "存在无法识别的状态"
+            elif pattern != "2" * len(guess) and not self.narrow_candidates(candidates, guess, feedback):
+                reason = f"反馈 {pattern} 与所有剩余候选矛盾"
+            else:
+                return feedback
+            print(f"⚠️ {reason}，重新读取 ({retry + 1}/{FEEDBACK_READ_RETRIES})")
+        return None
+    
+    def read_answer_from_state(self, guess: str, feedback) -> Optional[str]:
+        """从页面的 localStorage 中识别当日答案
+
+        在存储的所有字符串（含嵌套 JSON、base64 与字符数组）中查找与探测猜测的反馈一致的词典等式，
+        恰好找到一个时返回该等式，否则返回 None 并回退到逐回合游玩。
+        """
+        try:
+            raw = self.driver.execute_script(LOCAL_STORAGE_SCRIPT)
+            state = json.loads(raw) if raw else {}
+        except Exception as e:
+            print(f"读取页面状态失败: {e}")
+            return None
+        
+        remaining = self.narrow_candidates(CandidateSet(self.index), guess, feedback)
+        found = {
+            text for text in _iter_state_strings(state, self.index.length) if text in remaining
+        }
+        if len(found) != 1:
+            print(f"页面状态中未能唯一确定答案（匹配 {len(found)} 个），继续逐回合游玩")
+            return None
+        return found.pop()
+    
+    def wait_for_board(self, timeout: float = BOARD_WAIT_TIMEOUT) -> bool:
+        """等待游戏棋盘渲染完成"""
+        from selenium.common.exceptions import TimeoutException
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, BOARD_SELECTOR))
+            )
+            return True
+        except TimeoutException:
+            print("等待棋盘超时，继续执行...")
+            return False
+    
     def optimize_page_loading(self):
         """优化页面加载"""
         print("优化页面加载...")
@@ -617,113 +779,172 @@ class NerdleAutoPlayer:
 """
         try:
             self.driver.execute_script(ad_block_script)
-            time.sleep(1)
         except:
             print("脚本注入失败，继续执行...")
     
-    def run_auto_game(self) -> GameHistory | None:
-        """运行自动游戏 - 主逻辑"""
-        if not self.setup_driver():
+    def type_guess(self, guess: str) -> bool:
+        """在页面中输入一次猜测，全部输入方式失败时返回 False"""
+        try:
+            # 确保页面有焦点
+            self.driver.execute_script("window.focus();")
+            time.sleep(0.2)
+
+            # 使用JavaScript输入作为备选
+            try:
+                body = WebDriverWait(self.driver, 3).until(
+                    EC.presence_of_element_located((By.TAG_NAME, 'body'))
+                )
+                for char in guess:
+                    body.send_keys(char)
+                    time.sleep(0.1)
+                body.send_keys(Keys.RETURN)
+                print(f"✓ 输入完成")
+            except:
+                # 如果常规输入失败，尝试JavaScript
+                print("常规输入失败，尝试JavaScript输入...")
+                for char in guess:
+                    self.driver.execute_script(f"document.activeElement.value += '{char}';")
+                    time.sleep(0.1)
+                self.driver.execute_script("""
+                var e = new KeyboardEvent('keydown', {key: 'Enter', keyCode: 13});
+                document.dispatchEvent(e);
+                """)
+        except Exception as e:
+            print(f"✗ 输入失败: {e}")
+            # 尝试备用方法
+            try:
+                body = self.driver.find_element(By.TAG_NAME, 'body')
+                body.send_keys(guess + Keys.RETURN)
+            except Exception as e2:
+                print(f"备用输入也失败: {e2}")
+                return False
+        return True
+    
+    def run_auto_game(
+        self, on_step: Optional[Callable[[GameHistory, GameStep], None]] = None
+    ) -> GameHistory | None:
+        """运行自动游戏 - 主逻辑
+
+        `on_step` 会在每一步的反馈读取完成后立即被调用（在游戏线程中）。
+        """
+        from selenium.common.exceptions import TimeoutException
+        
+        timings: Dict[str, float] = {}
+        game_start = time.perf_counter()
+        with record_span(timings, "setup_driver"):
+            driver_ready = self.setup_driver()
+        if not driver_ready:
             return None
         
         try:
             # 访问网站
-            print("访问 nerdlegame.com...")
-            target_url = "https://nerdlegame.com/"
-            
-            try:
-                self.driver.set_page_load_timeout(5)
-                self.driver.get(target_url)
-            except TimeoutException:
-                print("页面加载超时，但可能已部分加载，继续执行...")
-            except Exception as e:
-                print(f"访问页面失败: {e}")
-                return False
-            
-            # 等待页面基本加载
-            time.sleep(2)
+            target_url = self.variant.url
+            print(f"访问 {target_url}...")
             
-            # 优化页面加载
-            self.optimize_page_loading()
+            with self.page():
+                with record_span(timings, "page_load"):
+                    restored = False
+                    try:
+                        self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+                        if self.snapshot:
+                            # 恢复失败（包括加载超时）不影响游戏，照常打开游戏页面
+                            try:
+                                restored = self.snapshot.restore(self.driver, target_url)
+                            except Exception as e:
+                                print(f"恢复会话快照失败: {e}")
+                                restored = False
+                        self.driver.get(cache_busted(target_url))
+                    except TimeoutException:
+                        print("页面加载超时，但可能已部分加载，继续执行...")
+                    except Exception as e:
+                        print(f"访问页面失败: {e}")
+                        return False
+                
+                    # 等待棋盘出现即可开始，不再固定等待
+                    self.wait_for_board()
             
-            # 关闭弹窗 - 使用更可靠的方法
-            print("尝试关闭弹窗...")
-            try:
-                actions = ActionChains(self.driver)
-                actions.send_keys(Keys.ESCAPE).perform()
-                time.sleep(0.5)
-                print("尝试ESC键关闭")
-            except:
-                pass
+                with record_span(timings, "page_prepare"):
+                    # 优化页面加载
+                    self.optimize_page_loading()
+                
+                    # 关闭弹窗 - 使用更可靠的方法（已恢复会话快照时不会出现）
+                    if not restored:
+                        print("尝试关闭弹窗...")
+                        try:
+                            actions = ActionChains(self.driver)
+                            actions.send_keys(Keys.ESCAPE).perform()
+                            time.sleep(0.5)
+                            print("尝试ESC键关闭")
+                        except:
+                            pass
 
             # 开始游戏
             print("\n加载候选等式...")
-            candidates = self.all_candidates[:]
+            candidates = CandidateSet(self.index)
             print(f"✓ 共加载 {len(candidates)} 个候选等式")
             
             # 创建历史记录
-            history = GameHistory(answer="", steps=[])
+            history = GameHistory(answer="", steps=[], timings=timings)
             
             answer = None
-            first_guess = "1+56/7=9"
+            known_answer: Optional[str] = None
+            # 沿决策树查找猜测，树不可用或反馈不在树中时回退到实时计算
+            tree_node = self.tree
+            next_guess = tree_guess(tree_node) or self.variant.first_guess
             
-            for attempt in range(6):
-                print(f"\n=== 第 {attempt + 1}/6 次尝试 ===")
+            for attempt in range(MAX_ATTEMPTS):
+                print(f"\n=== 第 {attempt + 1}/{MAX_ATTEMPTS} 次尝试 ===")
+                step_timings: Dict[str, float] = {}
                 
-                # 选择猜测
-                if attempt == 0:
-                    guess = first_guess
+                # 选择猜测（上一回合已给出建议时直接使用）
+                if next_guess:
+                    guess = next_guess
                 else:
-                    guess = self.suggest_next_guess(candidates, history.steps)
-                    if not guess and candidates:
-                        guess = candidates[0]
-                    elif not guess:
-                        guess = "12+45=57"  # 备用猜测
+                    with record_span(step_timings, "suggest"):
+                        guess = self.choose_guess(candidates, history.steps)
+                    if not guess:
+                        guess = self.variant.first_guess  # 备用猜测
                 
                 print(f"猜测: {guess}")
                 
-                # 键盘输入
-                try:
-                    # 确保页面有焦点
-                    self.driver.execute_script("window.focus();")
-                    time.sleep(0.2)
+                if known_answer:
+                    # 已从页面状态得知答案，本地模拟反馈，不再操作浏览器
+                    feedback = unpack_feedback(guess, feedback_pattern(known_answer, guess))
+                else:
+                    # 键盘输入
+                    with record_span(step_timings, "input"), self.page():
+                        if not self.type_guess(guess):
+                            return None
                     
-                    # 使用JavaScript输入作为备选
-                    try:
-                        body = WebDriverWait(self.driver, 3).until(
-                            EC.presence_of_element_located((By.TAG_NAME, 'body'))
+                    # 获取反馈
+                    with record_span(step_timings, "feedback"):
+                        feedback = self.read_verified_feedback(attempt, guess, candidates)
+                    if not feedback:
+                        # 不再以全部 absent 代替，候选保持不变，仅排除本次猜测
+                        print("⚠️ 无法获取可信的反馈，本回合不收窄候选")
+                        FEEDBACK_FALLBACKS.inc()
+                        candidates = candidates.discard(guess)
+                        tree_node = None
+                        next_guess = ""
+                        # 网站已用掉这一行，仍需记录，使步骤与页面上的行一一对应
+                        step = GameStep(
+                            guess=guess,
+                            pattern=UNKNOWN_CODE * len(guess),
+                            candidate_count=len(candidates),
+                            next_suggestion="",
+                            timings=step_timings
                         )
-                        for char in guess:
-                            body.send_keys(char)
-                            time.sleep(0.1)
-                        body.send_keys(Keys.RETURN)
-                        print(f"✓ 输入完成")
-                    except:
-                        # 如果常规输入失败，尝试JavaScript
-                        print("常规输入失败，尝试JavaScript输入...")
-                        for char in guess:
-                            self.driver.execute_script(f"document.activeElement.value += '{char}';")
-                            time.sleep(0.1)
-                        self.driver.execute_script("""
-                        var e = new KeyboardEvent('keydown', {key: 'Enter', keyCode: 13});
-                        document.dispatchEvent(e);
-                        """)
-                except Exception as e:
-                    print(f"✗ 输入失败: {e}")
-                    # 尝试备用方法
-                    try:
-                        body = self.driver.find_element(By.TAG_NAME, 'body')
-                        body.send_keys(guess + Keys.RETURN)
-                    except Exception as e2:
-                        print(f"备用输入也失败: {e2}")
-                        return None
-                
-                # 获取反馈
-                feedback = self.get_feedback_from_page(attempt, guess)
-                if not feedback:
-                    print("⚠️ 无法获取反馈，使用模拟反馈")
-                    # 简单模拟反馈：全部设为absent
-                    feedback = [{"char": guess[i], "status": "absent"} for i in range(8)]
+                        history.steps.append(step)
+                        if on_step:
+                            on_step(history, step)
+                        continue
+                    
+                    if self.fast_path and attempt == 0 and pack_feedback(feedback) != "2" * len(guess):
+                        with record_span(timings, "state_read"), self.page():
+                            known_answer = self.read_answer_from_state(guess, feedback)
+                        if known_answer:
+                            print("✓ 已从页面状态读取答案，余下回合在本地求解")
+                            STATE_FAST_PATH.inc()
                 
                 print(f"反馈: {[fb['status'] for fb in feedback]}")
                 
@@ -734,50 +955,47 @@ class NerdleAutoPlayer:
                     
                     step = GameStep(
                         guess=guess,
-                        feedback=feedback,
+                        pattern=pack_feedback(feedback, strict=False),
                         candidate_count=1,
-                        next_suggestion=""
+                        next_suggestion="",
+                        timings=step_timings
                     )
                     history.steps.append(step)
                     history.answer = answer
+                    if on_step:
+                        on_step(history, step)
                     break
                 
                 # 过滤候选
-                new_candidates = []
-                for cand in candidates:
-                    simulated = self.nerdle_feedback(cand, guess)
-                    
-                    ok = True
-                    for i in range(8):
-                        if simulated[i]["status"] != feedback[i]["status"]:
-                            ok = False
-                            break
-                    
-                    if ok:
-                        new_candidates.append(cand)
-                
-                candidates = new_candidates
+                with record_span(step_timings, "filter"):
+                    candidates = self.narrow_candidates(candidates, guess, feedback)
                 print(f"剩余候选: {len(candidates)} 个")
                 
                 if candidates and len(candidates) <= 10:
-                    print(f"候选示例: {candidates}")
+                    print(f"候选示例: {candidates.to_list()}")
                 
                 # 建议下一个猜测
                 next_guess = ""
-                if candidates:
-                    if len(candidates) == 1:
-                        next_guess = candidates[0]
-                    else:
-                        next_guess = self.suggest_next_guess(candidates, history.steps)
+                tree_node = tree_child(tree_node, pack_feedback(feedback))
+                if tree_node is not None and not self.tree_allows(tree_node, candidates):
+                    tree_node = None
+                if tree_node is not None:
+                    next_guess = tree_guess(tree_node)
+                elif candidates:
+                    with record_span(step_timings, "suggest"):
+                        next_guess = self.choose_guess(candidates, history.steps)
                 
                 # 创建步骤记录
                 step = GameStep(
                     guess=guess,
-                    feedback=feedback,
+                    pattern=pack_feedback(feedback, strict=False),
                     candidate_count=len(candidates),
-                    next_suggestion=next_guess
+                    next_suggestion=next_guess,
+                    timings=step_timings
                 )
                 history.steps.append(step)
+                if on_step:
+                    on_step(history, step)
                 
                 # 如果没有候选了，结束游戏
                 if not candidates:
@@ -787,13 +1005,21 @@ class NerdleAutoPlayer:
             # 确定最终答案
             if not answer and history.steps:
                 if candidates:
-                    answer = candidates[0]
+                    answer = candidates.first()
                 else:
                     answer = history.steps[-1].guess
             
             # 更新历史记录中的答案
             history.answer = answer or "未知"
             
+            if self.snapshot and answer:
+                try:
+                    with self.page():
+                        self.snapshot.capture(self.driver)
+                except Exception as e:
+                    print(f"保存会话快照失败: {e}")
+            timings["total"] = round(time.perf_counter() - game_start, 4)
+            
             return history
             
         except Exception as e:
@@ -805,7 +1031,31 @@ class NerdleAutoPlayer:
             if self.driver:
                 try:
                     print("正在关闭浏览器...")
-                    self.driver.quit()
+                    self.close_driver()
                     print("✓ 浏览器已关闭")
                 except:
-                    print("✗ 关闭浏览器时出错")
\ No newline at end of file
+                    print("✗ 关闭浏览器时出错")
+
+
+def play_in_tabs(players: List[NerdleAutoPlayer]) -> List[Optional[GameHistory]]:
+    """在同一个浏览器的不同标签页中同时进行多局游戏
+
+    浏览器按第一位玩家的配置启动，每局游戏在各自的线程中运行，结果顺序与 `players` 一致。
+    """
+    if not players:
+        return []
+    session = SharedBrowser(players[0].make_backend())
+    try:
+        session.start()
+    except Exception as e:
+        print(f"✗ 启动浏览器失败: {e}")
+        BROWSER_LAUNCH_FAILURES.inc()
+        return [None] * len(players)
+    
+    try:
+        for player in players:
+            player.session = session
+        with ThreadPoolExecutor(max_workers=len(players)) as executor:
+            return list(executor.map(lambda player: player.run_auto_game(), players))
+    finally:
+        session.quit()
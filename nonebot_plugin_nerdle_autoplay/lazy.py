@@ -0,0 +1,35 @@
+import importlib
+from typing import Any, Optional
+
+
+class LazyImport:
+    """延迟导入：首次访问属性（或调用）时才导入模块
+
+    `LazyImport("PIL.Image")` 代替 `from PIL import Image`，
+    `LazyImport("selenium.webdriver.common.by", "By")` 代替 `from selenium.webdriver.common.by import By`。
+    异常类需要在 `except` 中使用，不能用它代替，改为在用到的函数内导入。
+    """
+
+    __slots__ = ("_module", "_attr", "_target")
+
+    def __init__(self, module: str, attr: Optional[str] = None):
+        self._module = module
+        self._attr = attr
+        self._target: Any = None
+
+    def _load(self) -> Any:
+        if self._target is None:
+            target = importlib.import_module(self._module)
+            self._target = getattr(target, self._attr) if self._attr else target
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        target = f"{self._module}.{self._attr}" if self._attr else self._module
+        state = "loaded" if self._target is not None else "not loaded"
+        return f"<LazyImport {target} ({state})>"
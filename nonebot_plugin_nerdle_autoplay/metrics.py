@@ -0,0 +1,181 @@
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """指标基类"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self.lock = threading.Lock()
+
+    def expose(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self.samples())
+        return lines
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """单调递增计数器"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str):
+        super().__init__(name, documentation)
+        self.values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = _label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(_label_key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            items = sorted(self.values.items()) or [((), 0)]
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    """可增可减的仪表"""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: str):
+        with self.lock:
+            self.values[_label_key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """累积直方图"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]):
+        super().__init__(name, documentation)
+        self.buckets = sorted(buckets) + [float("inf")]
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        with self.lock:
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            lines = [
+                f"{self.name}_bucket{_format_labels((), [('le', _format_value(bound))])} {count}"
+                for bound, count in zip(self.buckets, self.counts)
+            ]
+            lines.append(f"{self.name}_sum {_format_value(self.sum)}")
+            lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self.register(Counter(name, documentation))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        return self.register(Gauge(name, documentation))  # type: ignore[return-value]
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float]) -> Histogram:
+        return self.register(Histogram(name, documentation, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        """生成 Prometheus 文本格式"""
+        lines: List[str] = []
+        for metric in self.metrics.values():
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = MetricsRegistry()
+
+AUTOPLAY_INVOCATIONS = registry.counter(
+    "nerdle_autoplay_invocations_total", "nerdle autoplay 命令调用次数"
+)
+CACHE_HITS = registry.counter("nerdle_cache_hits_total", "读取缓存命中次数")
+CACHE_MISSES = registry.counter("nerdle_cache_misses_total", "读取缓存未命中次数")
+BROWSER_LAUNCH_FAILURES = registry.counter(
+    "nerdle_browser_launch_failures_total", "浏览器启动失败次数"
+)
+FEEDBACK_FALLBACKS = registry.counter(
+    "nerdle_feedback_fallback_total", "多次重读仍无法得到可信页面反馈的次数"
+)
+STATE_FAST_PATH = registry.counter(
+    "nerdle_state_fast_path_total", "从页面状态读取答案并在本地完成求解的局数"
+)
+GAME_TURNS = registry.histogram(
+    "nerdle_game_turns", "每局游戏的尝试次数", buckets=[1, 2, 3, 4, 5, 6]
+)
+GAME_DURATION = registry.histogram(
+    "nerdle_game_duration_seconds", "每局自动游戏的耗时",
+    buckets=[10, 30, 60, 120, 180, 300, 600],
+)
+RENDER_SECONDS = registry.histogram(
+    "nerdle_render_seconds", "渲染单张图片的耗时",
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1],
+)
+GAMES_RUNNING = registry.gauge("nerdle_games_running", "正在进行的浏览器游戏局数")
+QUEUE_DEPTH = registry.gauge("nerdle_queue_depth", "排队等待的游戏请求数")
+QUEUE_WAIT_SECONDS = registry.histogram(
+    "nerdle_queue_wait_seconds", "游戏请求排队等待的时间",
+    buckets=[0, 1, 10, 30, 60, 120, 300, 600],
+)
+GAMES_REJECTED = registry.counter("nerdle_games_rejected_total", "因排队已满被拒绝的游戏请求数")
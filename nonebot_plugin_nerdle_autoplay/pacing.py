@@ -0,0 +1,78 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from .config import Config
+
+
+class TokenBucket:
+    """令牌桶限速器"""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        # 时钟与等待函数可替换，便于测试
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = self.capacity
+        self.updated = clock()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """取出一个令牌，不足时等待"""
+        async with self.lock:
+            self._refill()
+            if self.tokens < 1:
+                await self.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class MessageScheduler:
+    """演示消息节奏调度器"""
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.global_bucket: Optional[TokenBucket] = None
+        if config.nerdle_global_rate > 0:
+            self.global_bucket = TokenBucket(
+                config.nerdle_global_rate, config.nerdle_global_burst
+            )
+        self.adapter_buckets: Dict[str, TokenBucket] = {}
+
+    @property
+    def compact(self) -> bool:
+        return self.config.nerdle_pacing_mode == "compact"
+
+    def _get_adapter_bucket(self, adapter: str) -> Optional[TokenBucket]:
+        rate = self.config.nerdle_adapter_rate_limits.get(adapter, 0)
+        if rate <= 0:
+            return None
+        if adapter not in self.adapter_buckets:
+            self.adapter_buckets[adapter] = TokenBucket(rate, 1)
+        return self.adapter_buckets[adapter]
+
+    async def throttle(self, adapter: str):
+        """发送消息前调用，按适配器限速与全局限速依次取令牌"""
+        bucket = self._get_adapter_bucket(adapter)
+        if bucket:
+            await bucket.acquire()
+        if self.global_bucket:
+            await self.global_bucket.acquire()
+
+    async def pause(self, seconds: float):
+        """演示间隔，compact 模式下不等待"""
+        if self.compact or seconds <= 0:
+            return
+        await asyncio.sleep(seconds)
@@ -0,0 +1,116 @@
+import cProfile
+import pstats
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T", bound=Callable)
+
+# 性能分析文件目录（与缓存目录同级）
+PROFILE_DIR = Path(__file__).parent / "profiles"
+
+
+class GameProfile:
+    """一局游戏的分析记录
+
+    cProfile 分析器不能同时在多个线程中启用（游戏线程求解的同时，run_sync 线程可能在渲染图片），
+    因此每个线程各用一个分析器，写出时再合并。
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.profiles: Dict[int, cProfile.Profile] = {}
+
+    def for_current_thread(self) -> cProfile.Profile:
+        """当前线程使用的分析器"""
+        ident = threading.get_ident()
+        with self.lock:
+            profile = self.profiles.get(ident)
+            if profile is None:
+                profile = self.profiles[ident] = cProfile.Profile()
+        return profile
+
+    def stats(self) -> Optional[pstats.Stats]:
+        """合并各线程的记录，没有记录到任何调用时返回 None"""
+        with self.lock:
+            profiles = [profile for profile in self.profiles.values() if profile.getstats()]
+        if not profiles:
+            return None
+        return pstats.Stats(*profiles)
+
+
+class HotPathProfiler:
+    """热点函数性能分析器
+
+    开启后，被 `profiled` 装饰的函数在当前游戏的上下文中以 cProfile 运行，
+    每局游戏（及其中的每个线程）使用各自的分析器；游戏结束后将结果写入 `PROFILE_DIR`，仅保留最近的若干份。
+    """
+
+    def __init__(self, enabled: bool = False, keep: int = 20):
+        self.enabled = enabled
+        self.keep = keep
+        self.current: ContextVar[Optional[GameProfile]] = ContextVar(
+            "nerdle_profile", default=None
+        )
+        # 同一线程内嵌套的被装饰函数只由最外层记录
+        self.local = threading.local()
+
+    def start_game(self) -> Optional[GameProfile]:
+        """为当前上下文（一局游戏）创建分析记录"""
+        if not self.enabled:
+            return None
+        game = GameProfile()
+        self.current.set(game)
+        return game
+
+    def profiled(self, func: T) -> T:
+        """装饰器：在开启分析的游戏上下文中记录函数调用"""
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            game = self.current.get()
+            if game is None or getattr(self.local, "active", False):
+                return func(*args, **kwargs)
+            profile = game.for_current_thread()
+            try:
+                profile.enable()
+            except ValueError:
+                # Python 3.12 起同一时刻只允许一个 cProfile 分析器，另一局正在记录时本次调用不记录
+                return func(*args, **kwargs)
+            self.local.active = True
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.local.active = False
+                profile.disable()
+
+        return wrapper  # type: ignore[return-value]
+
+    def dump(self, game: GameProfile, tag: str) -> Optional[Path]:
+        """写出合并后的分析结果并轮转旧文件，没有记录到任何调用时不写出并返回 None"""
+        stats = game.stats()
+        if stats is None:
+            return None
+        PROFILE_DIR.mkdir(exist_ok=True)
+        path = PROFILE_DIR / f"{tag}_{time.strftime('%Y-%m-%d_%H-%M-%S')}.prof"
+        stats.dump_stats(str(path))
+        self.rotate()
+        return path
+
+    def rotate(self):
+        """仅保留最近的 keep 份分析文件"""
+        files = sorted(
+            PROFILE_DIR.glob("*.prof"), key=lambda x: x.stat().st_mtime, reverse=True
+        )
+        for old in files[self.keep:]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+profiler = HotPathProfiler()
+profiled = profiler.profiled
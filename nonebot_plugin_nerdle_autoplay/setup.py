@@ -7,7 +7,9 @@ setup(
     install_requires=[
         "selenium>=4.15.0",
         "pillow>=10.1.0",
-        "webdriver-manager>=4.0.1"
+        "webdriver-manager>=4.0.1",
+        # Windows 没有系统时区数据库，zoneinfo 需要 tzdata
+        "tzdata; platform_system == 'Windows'"
     ],
     entry_points={
         "nonebot.plugin": [
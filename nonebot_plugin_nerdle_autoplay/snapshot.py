@@ -0,0 +1,129 @@
+# 浏览器会话快照：保存同意弹窗、新手引导等状态，下次启动时恢复以跳过这些弹窗
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode, urlsplit, urlunsplit
+
+# 快照文件目录（与缓存目录同级）
+SNAPSHOT_DIR = Path(__file__).parent / "snapshot"
+
+# 以 JSON 字符串形式导出页面的 localStorage
+LOCAL_STORAGE_SCRIPT = """
+var state = {};
+for (var i = 0; i < localStorage.length; i++) {
+    var key = localStorage.key(i);
+    state[key] = localStorage.getItem(key);
+}
+return JSON.stringify(state);
+"""
+
+RESTORE_STORAGE_SCRIPT = """
+var state = arguments[0];
+for (var key in state) {
+    localStorage.setItem(key, state[key]);
+}
+"""
+
+# 记录当日棋盘、答案等游戏进度的条目不保存，保证每天都加载新题目
+GAME_STATE_KEYWORDS = ("gamestate", "game_state", "board", "guess", "solution", "answer", "history")
+EQUATION_PATTERN = re.compile(r"[0-9+\-*/]{1,7}=[0-9+\-*/]{1,7}")
+MAX_VALUE_SIZE = 2048
+
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "expiry", "sameSite")
+
+
+def cache_busted(url: str) -> str:
+    """在地址后追加时间戳参数，避免页面或脚本被缓存为旧的题目"""
+    parts = urlsplit(url)
+    query = "&".join(filter(None, [parts.query, urlencode({"_": int(time.time())})]))
+    return urlunsplit(parts._replace(query=query))
+
+
+def prune_storage(storage: Dict[str, Any]) -> Dict[str, str]:
+    """仅保留与游戏进度无关的 localStorage 条目"""
+    kept = {}
+    for key, value in storage.items():
+        if not isinstance(value, str) or len(value) > MAX_VALUE_SIZE:
+            continue
+        if any(word in key.lower() for word in GAME_STATE_KEYWORDS):
+            continue
+        if EQUATION_PATTERN.search(value):
+            continue
+        kept[key] = value
+    return kept
+
+
+class SessionSnapshot:
+    """站点 Cookie 与精简后的 localStorage 快照"""
+
+    def __init__(self, domain: str = "nerdlegame.com", max_age_days: int = 7):
+        self.domain = domain
+        self.max_age = max_age_days * 86400
+        self.path = SNAPSHOT_DIR / f"{domain}.json"
+        self.lock = threading.Lock()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """读取快照，不存在、损坏或过期时返回 None"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - data.get("saved_at", 0) > self.max_age:
+            return None
+        return data
+
+    def save(self, cookies: List[Dict[str, Any]], storage: Dict[str, str]):
+        """原子地写入快照"""
+        data = {"saved_at": int(time.time()), "cookies": cookies, "local_storage": storage}
+        SNAPSHOT_DIR.mkdir(exist_ok=True)
+        with self.lock:
+            fd, tmp_path = tempfile.mkstemp(dir=SNAPSHOT_DIR, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+    def capture(self, driver):
+        """从当前页面保存快照（只保留本站 Cookie）"""
+        cookies = [
+            {key: cookie[key] for key in COOKIE_FIELDS if key in cookie}
+            for cookie in driver.get_cookies()
+            if cookie.get("domain", "").lstrip(".").endswith(self.domain)
+        ]
+        raw = driver.execute_script(LOCAL_STORAGE_SCRIPT)
+        storage = prune_storage(json.loads(raw) if raw else {})
+        self.save(cookies, storage)
+        print(f"✓ 已保存会话快照（{len(cookies)} 个 Cookie，{len(storage)} 项存储）")
+
+    def restore(self, driver, url: str) -> bool:
+        """导航到同源的轻量页面写入快照，之后再打开游戏页面即可生效"""
+        data = self.load()
+        if not data:
+            return False
+        parts = urlsplit(url)
+        driver.get(f"{parts.scheme}://{parts.netloc}/robots.txt")
+
+        now = time.time()
+        for cookie in data.get("cookies", []):
+            if cookie.get("expiry", now + 1) <= now:
+                continue
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                pass
+        if data.get("local_storage"):
+            driver.execute_script(RESTORE_STORAGE_SCRIPT, data["local_storage"])
+        print("✓ 已恢复会话快照")
+        return True
@@ -0,0 +1,571 @@
+"""Nerdle 求解引擎，插件与 click_nerdle.py 共用
+
+纯 Python 实现，模块级不导入 selenium / Pillow（safe_find_elements 在调用时才导入 selenium），
+可被脚本、基准测试与工作进程低成本导入。
+"""
+import hashlib
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple, Union
+
+# 反馈状态与紧凑编码
+STATUS_TO_CODE = {"absent": "0", "present": "1", "correct": "2"}
+CODE_TO_STATUS = {code: status for status, code in STATUS_TO_CODE.items()}
+# 未能读取反馈的格子
+UNKNOWN_CODE = "?"
+
+# 求解模式：hard 只猜剩余候选（符合困难模式）；free 可用整个词典中的探测猜测；
+# hybrid 候选较多时使用探测猜测，候选不多于阈值后只猜候选
+SOLVER_MODES = ("hard", "free", "hybrid")
+
+# 决策树目录
+TREE_DIR = Path(__file__).parent / "resources" / "tree"
+
+# 词典及其元数据目录
+EQUALS_DIR = Path(__file__).parent / "resources" / "equals"
+METADATA_VERSION = 1
+
+
+def feedback_pattern(answer: str, guess: str) -> str:
+    """计算反馈的紧凑编码（0=absent, 1=present, 2=correct），与逐字符反馈等价"""
+    result = ["0"] * len(guess)
+    unmatched: Dict[str, int] = {}
+    for i, char in enumerate(answer):
+        if guess[i] == char:
+            result[i] = "2"
+        else:
+            unmatched[char] = unmatched.get(char, 0) + 1
+    for i, char in enumerate(guess):
+        if result[i] == "0" and unmatched.get(char, 0):
+            result[i] = "1"
+            unmatched[char] -= 1
+    return "".join(result)
+
+
+def pack_feedback(feedback: List[Dict[str, str]], strict: bool = True) -> str:
+    """逐字符反馈转为紧凑编码
+
+    `strict` 为真时遇到无法识别的状态返回空串，否则按 absent 处理。
+    """
+    codes = [STATUS_TO_CODE.get(fb.get("status", "")) for fb in feedback]
+    if None in codes:
+        if strict:
+            return ""
+        codes = [code or "0" for code in codes]
+    return "".join(codes)  # type: ignore[arg-type]
+
+
+def unpack_feedback(guess: str, pattern: str) -> List[Dict[str, str]]:
+    """紧凑编码还原为逐字符反馈，未知编码还原为 unknown"""
+    return [
+        {"char": char, "status": CODE_TO_STATUS.get(code, "unknown")}
+        for char, code in zip(guess, pattern)
+    ]
+
+
+def nerdle_feedback(answer: str, guess: str) -> List[Dict[str, str]]:
+    """计算逐字符反馈"""
+    return unpack_feedback(guess, feedback_pattern(answer, guess))
+
+
+# suggest_next_guess 的计算量为候选数的平方，候选多于此数时只在样本上评估
+SUGGEST_SAMPLE_SIZE = 256
+
+
+def suggest_next_guess(
+    candidates: List[str], history: Any = None, sample_size: int = SUGGEST_SAMPLE_SIZE
+) -> Optional[str]:
+    """在候选中选择不同反馈数量最多的等式，数量相同时取先出现者
+
+    候选多于 `sample_size` 时只在固定种子的随机样本（保持原有顺序）上评估。
+    """
+    if not candidates:
+        return None
+    if len(candidates) > sample_size:
+        picked = random.Random(len(candidates)).sample(range(len(candidates)), sample_size)
+        candidates = [candidates[i] for i in sorted(picked)]
+    best_guess = candidates[0]
+    max_unique_feedbacks = 0
+    for guess in candidates:
+        unique_count = len({feedback_pattern(answer, guess) for answer in candidates})
+        if unique_count > max_unique_feedbacks:
+            max_unique_feedbacks = unique_count
+            best_guess = guess
+            # 每个候选的反馈都不同，不可能更好
+            if unique_count == len(candidates):
+                break
+    return best_guess
+
+
+def filter_candidates_by_feedback(
+    candidates: List[str], guess: str, real_feedback: List[Dict[str, str]]
+) -> List[str]:
+    """只保留假设其为答案时对 guess 产生的反馈与实际反馈一致的候选"""
+    pattern = pack_feedback(real_feedback[:len(guess)])
+    if len(pattern) != len(guess):
+        return []
+    return [cand for cand in candidates if feedback_pattern(cand, guess) == pattern]
+
+
+def safe_find_elements(driver, by, selector, retries: int = 3):
+    """查找元素，遇到元素失效时稍后重试"""
+    from selenium.common.exceptions import StaleElementReferenceException
+
+    for attempt in range(retries):
+        try:
+            return driver.find_elements(by, selector)
+        except StaleElementReferenceException:
+            if attempt < retries - 1:
+                time.sleep(0.3)
+                continue
+            raise
+    return []
+
+
+def dictionary_hash(equations: Sequence[str]) -> str:
+    """词典内容哈希"""
+    return hashlib.sha1("\n".join(equations).encode("utf-8")).hexdigest()
+
+
+def dictionary_file(length: int) -> Path:
+    return EQUALS_DIR / f"dic-{length}.json"
+
+
+def metadata_file(length: int) -> Path:
+    return EQUALS_DIR / f"meta-{length}.json"
+
+
+def dictionary_metadata(equations: Sequence[str], raw: bytes) -> Dict[str, Any]:
+    """计算词典元数据：字符频率、各位置字符分布与内容哈希
+
+    `raw` 为词典文件的原始内容，加载时据其哈希判断元数据是否与文件一致。
+    """
+    length = len(equations[0]) if equations else 0
+    frequency: Counter = Counter()
+    presence: Counter = Counter()
+    positions = [Counter() for _ in range(length)]
+    for eq in equations:
+        frequency.update(eq)
+        presence.update(set(eq))
+        for pos, char in enumerate(eq):
+            positions[pos][char] += 1
+    return {
+        "version": METADATA_VERSION,
+        "length": length,
+        "count": len(equations),
+        "file_sha1": hashlib.sha1(raw).hexdigest(),
+        "dictionary": dictionary_hash(equations),
+        # 字符在整个词典中出现的总次数
+        "char_frequency": dict(sorted(frequency.items())),
+        # 含有该字符的等式数量
+        "char_presence": dict(sorted(presence.items())),
+        # position_histogram[p][c]：第 p 位是字符 c 的等式数量
+        "position_histogram": [dict(sorted(counter.items())) for counter in positions],
+    }
+
+
+def save_dictionary_metadata(metadata: Dict[str, Any], path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+
+def load_dictionary(length: int) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+    """读取词典文件及其元数据
+
+    元数据缺失、版本不符或与词典文件内容不一致时返回 None，此时词典需要逐条校验。
+    """
+    with open(dictionary_file(length), "rb") as f:
+        raw = f.read()
+    entries = json.loads(raw)
+    try:
+        with open(metadata_file(length), "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return entries, None
+    if (
+        metadata.get("version") != METADATA_VERSION
+        or metadata.get("length") != length
+        or metadata.get("count") != len(entries)
+        or metadata.get("file_sha1") != hashlib.sha1(raw).hexdigest()
+    ):
+        return entries, None
+    return entries, metadata
+
+
+def _bits_from_indices(indices: Sequence[int], size: int) -> int:
+    """由下标列表构造位集"""
+    buffer = bytearray((size + 7) // 8)
+    for i in indices:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class ConstraintIndex:
+    """词典上的位置/字符计数约束索引
+
+    为词典中每个 (位置, 字符) 以及每个 (字符, 至少出现次数) 预先计算位集，
+    候选集合同样以位集表示，按一次真实反馈收窄候选只需若干次按位与。
+    """
+
+    def __init__(self, equations: List[str], metadata: Optional[Dict[str, Any]] = None):
+        self.equations = equations
+        self.size = len(equations)
+        self.length = len(equations[0]) if equations else 8
+        self.full = (1 << self.size) - 1
+        self.lookup = {eq: idx for idx, eq in enumerate(equations)}
+        # 词典元数据中的全集计数（见 dictionary_metadata），没有时按位集现算
+        self.metadata = metadata
+
+        position_indices: List[Dict[str, List[int]]] = [{} for _ in range(self.length)]
+        count_indices: Dict[str, List[List[int]]] = {}
+        for idx, eq in enumerate(equations):
+            counts: Dict[str, int] = {}
+            for pos, char in enumerate(eq):
+                position_indices[pos].setdefault(char, []).append(idx)
+                counts[char] = counts.get(char, 0) + 1
+            for char, count in counts.items():
+                buckets = count_indices.setdefault(char, [])
+                while len(buckets) < count:
+                    buckets.append([])
+                for k in range(count):
+                    buckets[k].append(idx)
+
+        # position[p][c]：第 p 位是字符 c 的等式
+        self.position: List[Dict[str, int]] = [
+            {char: _bits_from_indices(indices, self.size) for char, indices in table.items()}
+            for table in position_indices
+        ]
+        # at_least[c][k]：字符 c 至少出现 k 次的等式（k 从 1 开始，下标 0 为全集）
+        self.at_least: Dict[str, List[int]] = {
+            char: [self.full] + [_bits_from_indices(indices, self.size) for indices in buckets]
+            for char, buckets in count_indices.items()
+        }
+
+    def bit(self, equation: str) -> int:
+        """等式对应的单个位，不在词典中时为 0"""
+        idx = self.lookup.get(equation)
+        return 0 if idx is None else 1 << idx
+
+    def count_mask(self, char: str, k: int) -> int:
+        """字符 char 至少出现 k 次的等式位集"""
+        if k <= 0:
+            return self.full
+        buckets = self.at_least.get(char)
+        if buckets is None or k >= len(buckets):
+            return 0
+        return buckets[k]
+
+    def narrow(self, mask: int, guess: str, feedback: List[Dict[str, str]]) -> int:
+        """根据一次反馈收窄候选位集"""
+        if len(guess) != self.length or len(feedback) < self.length:
+            return 0
+
+        hits: Dict[str, int] = {}
+        capped = set()
+        for pos in range(self.length):
+            char = guess[pos]
+            status = feedback[pos]["status"]
+            at_pos = self.position[pos].get(char, 0)
+            if status == "correct":
+                mask &= at_pos
+                hits[char] = hits.get(char, 0) + 1
+            elif status == "present":
+                mask &= ~at_pos
+                hits[char] = hits.get(char, 0) + 1
+            elif status == "absent":
+                mask &= ~at_pos
+                capped.add(char)
+            else:
+                return 0
+            if not mask:
+                return 0
+
+        for char in set(guess):
+            k = hits.get(char, 0)
+            # 至少出现 k 次；出现过 absent 时恰好出现 k 次
+            mask &= self.count_mask(char, k)
+            if char in capped:
+                mask &= ~self.count_mask(char, k + 1)
+        return mask
+
+    def rank_probes(self, mask: int, limit: int = 64) -> List[str]:
+        """按位置/字符计数的划分均衡度粗排整个词典，返回最有希望的若干个探测猜测
+
+        某一位置（或某一字符出现与否）把 n 个候选分成 k 与 n - k 两组时，记 k * (n - k) 分，
+        分数越高说明该猜测越能均匀地划分候选；之后再对这些猜测精确计算划分。
+        """
+        n = mask.bit_count()
+        if n <= 2:
+            return []
+        if mask == self.full and self.metadata is not None:
+            position_counts = self.metadata["position_histogram"]
+            present_counts = self.metadata["char_presence"]
+        else:
+            position_counts = [
+                {char: (mask & bits).bit_count() for char, bits in table.items()} for table in self.position
+            ]
+            present_counts = {char: (mask & buckets[1]).bit_count() for char, buckets in self.at_least.items()}
+        position_scores = [{char: k * (n - k) for char, k in counts.items()} for counts in position_counts]
+        present_scores = {char: k * (n - k) for char, k in present_counts.items()}
+        scored = []
+        for eq in self.equations:
+            score = sum(position_scores[pos][char] for pos, char in enumerate(eq))
+            score += sum(present_scores[char] for char in set(eq))
+            scored.append((score, eq))
+        scored.sort(reverse=True)
+        return [eq for _, eq in scored[:limit]]
+
+    def to_list(self, mask: int) -> List[str]:
+        """位集转为等式列表（保持词典顺序）"""
+        bits = bin(mask)[:1:-1]
+        return [self.equations[i] for i, bit in enumerate(bits) if bit == "1"]
+
+
+class CandidateSet:
+    """以词典位集表示的候选集合
+
+    收窄、计数、取首个与抽样都直接在位集上进行，只在需要时才展开为等式列表（并缓存）。
+    集合不可变，收窄返回新的集合。
+    """
+
+    __slots__ = ("index", "mask", "_list")
+
+    def __init__(self, index: ConstraintIndex, mask: Optional[int] = None):
+        self.index = index
+        self.mask = index.full if mask is None else mask
+        self._list: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return self.mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.mask != 0
+
+    def __contains__(self, equation: str) -> bool:
+        return bool(self.mask & self.index.bit(equation))
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def narrow(self, guess: str, feedback: List[Dict[str, str]]) -> "CandidateSet":
+        """按一次反馈收窄"""
+        return CandidateSet(self.index, self.index.narrow(self.mask, guess, feedback))
+
+    def discard(self, equation: str) -> "CandidateSet":
+        """去掉某个等式"""
+        return CandidateSet(self.index, self.mask & ~self.index.bit(equation))
+
+    def first(self) -> Optional[str]:
+        """词典顺序中的第一个候选"""
+        if not self.mask:
+            return None
+        return self.index.equations[(self.mask & -self.mask).bit_length() - 1]
+
+    def to_list(self) -> List[str]:
+        if self._list is None:
+            self._list = self.index.to_list(self.mask)
+        return self._list
+
+    def sample(self, k: int, rng: Optional[random.Random] = None) -> List[str]:
+        """随机抽取至多 k 个候选（候选不多于 k 个时返回全部）"""
+        if len(self) <= k:
+            return self.to_list()
+        return (rng or random).sample(self.to_list(), k)
+
+
+# 决策树节点：只剩一个候选时为该等式本身，否则为 [猜测, {反馈编码: 子节点}]
+TreeNode = Union[str, List[Any]]
+
+
+def _partition_key(guess: str, candidates: List[str]) -> tuple:
+    """猜测的划分质量：不同反馈数越多越好，其次最大分组越小越好"""
+    groups: Dict[str, int] = defaultdict(int)
+    for answer in candidates:
+        groups[feedback_pattern(answer, guess)] += 1
+    return (len(groups), -max(groups.values()))
+
+
+def rank_guesses(candidates: List[str], pool: Optional[List[str]] = None) -> List[str]:
+    """按划分质量从好到差排列猜测（默认只在候选中选择）"""
+    pool = candidates if pool is None else pool
+    return sorted(pool, key=lambda guess: _partition_key(guess, candidates), reverse=True)
+
+
+def best_partition_guess(candidates: List[str]) -> str:
+    """在候选中选择划分出不同反馈数最多的猜测，数量相同时取最大分组更小者"""
+    best_guess = candidates[0]
+    best_key = (-1, 0)
+    for guess in candidates:
+        key = _partition_key(guess, candidates)
+        if key > best_key:
+            best_key = key
+            best_guess = guess
+    return best_guess
+
+
+def best_probe_guess(
+    candidates: CandidateSet,
+    limit: int = 64,
+    sample_size: int = 512,
+    played: Collection[str] = (),
+) -> str:
+    """在整个词典中选择划分候选最好的猜测（不要求符合已知提示），划分相同时优先候选本身
+
+    候选很多时只在固定种子的随机样本上评估划分。`played` 中已猜过的等式不再选择
+    （某行反馈未能读取时候选不会收窄，不排除的话会一直选出同一个猜测）。
+    """
+    if len(candidates) <= 2:
+        return candidates.first() or ""
+    answers = candidates.sample(sample_size, random.Random(len(candidates)))
+    best_guess = ""
+    best_key: tuple = ()
+    for guess in candidates.index.rank_probes(candidates.mask, limit + len(played)) + answers[:limit]:
+        if guess in played:
+            continue
+        key = _partition_key(guess, answers) + (guess in candidates,)
+        if key > best_key:
+            best_key = key
+            best_guess = guess
+    return best_guess or candidates.first() or ""
+
+
+def _build_subtree(
+    candidates: List[str],
+    guess: str,
+    depth: int,
+    max_turns: int,
+    alternatives: int,
+    pool: List[str],
+) -> tuple:
+    """以指定猜测展开节点，返回 (节点, 各答案猜中次数)"""
+    depths: List[int] = []
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for answer in candidates:
+        groups[feedback_pattern(answer, guess)].append(answer)
+    children: Dict[str, TreeNode] = {}
+    for pattern in sorted(groups):
+        if pattern == "2" * len(guess):
+            depths.append(depth)
+            continue
+        child, child_depths = _build_node(
+            groups[pattern], depth + 1, max_turns, alternatives, pool
+        )
+        children[pattern] = child
+        depths.extend(child_depths)
+    return [guess, children], depths
+
+
+def _build_node(
+    candidates: List[str],
+    depth: int,
+    max_turns: int,
+    alternatives: int,
+    pool: List[str],
+) -> tuple:
+    if len(candidates) == 1:
+        return candidates[0], [depth]
+
+    best = None
+    best_score = None
+    # 先尝试贪心选择；超出回合上限时依次尝试排名靠前的其他猜测，
+    # 仍不满足时再从整个词典中挑选探测猜测
+    tried = set()
+    rounds = [
+        lambda: rank_guesses(candidates)[:alternatives],
+        lambda: rank_guesses(candidates, pool)[:alternatives],
+    ]
+    for round_index, ranked in enumerate(rounds):
+        guesses = [best_partition_guess(candidates)] if round_index == 0 else []
+        for guess in guesses + ranked():
+            if guess in tried:
+                continue
+            tried.add(guess)
+            node, depths = _build_subtree(candidates, guess, depth, max_turns, alternatives, pool)
+            score = (max(depths), sum(depths))
+            if best_score is None or score < best_score:
+                best, best_score = (node, depths), score
+            if best_score[0] <= max_turns:
+                return best
+    return best
+
+
+def build_decision_tree(
+    candidates: List[str],
+    first_guess: Optional[str] = None,
+    max_turns: int = 6,
+    alternatives: int = 8,
+    depths: Optional[List[int]] = None,
+) -> TreeNode:
+    """构建完整决策树（猜测 → 反馈 → 下一次猜测 ...）
+
+    每个节点优先使用贪心划分选择猜测，若某个分支超过 `max_turns` 次，
+    则在该节点尝试至多 `alternatives` 个其他猜测，取最坏次数最少（其次总次数最少）者。
+    `depths` 用于收集每个答案被猜中时所用的次数。
+    """
+    if first_guess:
+        node, node_depths = _build_subtree(
+            candidates, first_guess, 1, max_turns, alternatives, candidates
+        )
+    else:
+        node, node_depths = _build_node(candidates, 1, max_turns, alternatives, candidates)
+    if depths is not None:
+        depths.extend(node_depths)
+    return node
+
+
+def tree_file(length: int) -> Path:
+    return TREE_DIR / f"tree-{length}.json"
+
+
+def save_decision_tree(
+    tree: TreeNode, equations: Sequence[str], path: Path, max_depth: int
+):
+    """紧凑序列化决策树，并记录对应词典的哈希"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "version": 1,
+        "length": len(equations[0]),
+        "dictionary": dictionary_hash(equations),
+        "max_depth": max_depth,
+        "tree": tree,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_decision_tree(equations: Sequence[str], digest: Optional[str] = None) -> Optional[TreeNode]:
+    """加载与词典匹配的决策树，不存在或词典不一致时返回 None
+
+    `digest` 为预先计算的词典哈希（来自词典元数据），省略时现算。
+    """
+    if not equations:
+        return None
+    path = tree_file(len(equations[0]))
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != 1 or data.get("dictionary") != (digest or dictionary_hash(equations)):
+        return None
+    return data["tree"]
+
+
+def tree_guess(node: Optional[TreeNode]) -> Optional[str]:
+    """决策树节点对应的猜测"""
+    if node is None:
+        return None
+    return node if isinstance(node, str) else node[0]
+
+
+def tree_child(node: Optional[TreeNode], pattern: str) -> Optional[TreeNode]:
+    """按反馈编码走到下一个节点，不存在时返回 None"""
+    if node is None or isinstance(node, str):
+        return None
+    return node[1].get(pattern)
@@ -0,0 +1,54 @@
+import asyncio
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, AsyncIterator, Optional, Tuple
+
+from nonebot.utils import run_sync
+
+from .data_source import GameHistory, GameStep, NerdleAutoPlayer
+
+
+class GameStream:
+    """将线程中进行的游戏转为异步的步骤流
+
+    用法::
+
+        stream = GameStream(player, admission.slot())
+        async for history, index in stream:
+            ...  # history.steps[index] 刚刚完成
+        history = stream.result
+
+    `slot` 只在游戏线程运行期间持有（游戏结束即释放），消费方之后发送消息不占用名额；
+    获取名额时的异常（如排队已满）在迭代中抛出。
+    """
+
+    def __init__(self, player: NerdleAutoPlayer, slot: Optional[AsyncContextManager[Any]] = None):
+        self.player = player
+        self.slot = slot if slot is not None else nullcontext()
+        self.result: Optional[GameHistory] = None
+        # 获取名额时排队等待的秒数（slot 返回值）
+        self.waited: Any = None
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[GameHistory, int]]:
+        loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[Optional[Tuple[GameHistory, int]]]" = asyncio.Queue()
+
+        def on_step(history: GameHistory, step: GameStep):
+            # 在游戏线程中调用：此时 step 刚被追加到 history.steps 末尾
+            loop.call_soon_threadsafe(queue.put_nowait, (history, len(history.steps) - 1))
+
+        async def play() -> Optional[GameHistory]:
+            async with self.slot as waited:
+                self.waited = waited
+                return await run_sync(self.player.run_auto_game)(on_step)
+
+        game = asyncio.create_task(play())
+        game.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            while (item := await queue.get()) is not None:
+                yield item
+        finally:
+            if not game.done():
+                # 消费方提前退出时等待游戏线程结束，避免浏览器残留
+                await asyncio.wait([game])
+        self.result = game.result()
@@ -0,0 +1,54 @@
+import json
+import math
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, Tuple
+
+
+@contextmanager
+def record_span(timings: Dict[str, float], name: str) -> Iterator[None]:
+    """记录一段代码的耗时（秒），同名阶段多次记录时累加"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        timings[name] = round(timings.get(name, 0.0) + elapsed, 4)
+
+
+def format_timing_record(scope: str, phase: str, seconds: float, **extra) -> str:
+    """格式化为单行 JSON，便于日志采集"""
+    record = {"scope": scope, "phase": phase, "seconds": seconds}
+    record.update(extra)
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """最近秩法计算百分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class TimingStats:
+    """按阶段聚合最近若干局的耗时"""
+
+    def __init__(self, maxlen: int = 200):
+        self.samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=maxlen))
+
+    def add(self, phase: str, seconds: float):
+        self.samples[phase].append(seconds)
+
+    def summary(self) -> List[Tuple[str, int, float, float]]:
+        """返回 (阶段, 样本数, p50, p95) 列表"""
+        result = []
+        for phase in sorted(self.samples):
+            values = list(self.samples[phase])
+            result.append((phase, len(values), percentile(values, 50), percentile(values, 95)))
+        return result
+
+    def clear(self):
+        self.samples.clear()
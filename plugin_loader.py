@@ -0,0 +1,25 @@
+"""
+脚本使用插件模块的入口
+
+插件的 __init__.py 需要运行中的 NoneBot，脚本不能直接导入插件包。
+这里只登记插件包而不执行它的 __init__.py，之后即可按
+`from nonebot_plugin_nerdle_autoplay.solver import ...` 正常导入包内不依赖 NoneBot 的模块，
+这些模块仍以包内模块的身份加载，不会作为顶层模块暴露。
+"""
+
+import importlib.util
+import os
+import sys
+
+PACKAGE = "nonebot_plugin_nerdle_autoplay"
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), PACKAGE)
+
+
+def register_plugin_package():
+    """登记插件包（不执行 __init__.py），已导入时不做任何事"""
+    if PACKAGE in sys.modules:
+        return
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, os.path.join(PACKAGE_DIR, "__init__.py"), submodule_search_locations=[PACKAGE_DIR]
+    )
+    sys.modules[PACKAGE] = importlib.util.module_from_spec(spec)
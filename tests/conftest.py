@@ -0,0 +1,10 @@
+import os
+import sys
+
+import nonebot
+
+# 插件位于仓库根目录下，需要先初始化 NoneBot 才能导入
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+nonebot.init(driver="~none")
+nonebot.load_plugin("nonebot_plugin_nerdle_autoplay")
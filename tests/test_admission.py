@@ -0,0 +1,123 @@
+import asyncio
+import threading
+
+import pytest
+
+from nonebot_plugin_nerdle_autoplay.admission import AdmissionController, QueueFullError
+from nonebot_plugin_nerdle_autoplay.data_source import GameHistory, GameStep
+from nonebot_plugin_nerdle_autoplay.stream import GameStream
+
+
+def test_waiters_are_admitted_in_arrival_order():
+    order = []
+
+    async def run():
+        admission = AdmissionController(max_concurrent=1, max_queue=5)
+        release = asyncio.Event()
+
+        async def game(name: str):
+            async with admission.slot():
+                order.append(name)
+                await release.wait()
+
+        tasks = []
+        for name in "abcd":
+            tasks.append(asyncio.create_task(game(name)))
+            await asyncio.sleep(0)
+        assert admission.running == 1
+        assert admission.queue_depth == 3
+        release.set()
+        await asyncio.gather(*tasks)
+        assert admission.running == 0
+
+    asyncio.run(run())
+    assert order == list("abcd")
+
+
+def test_queue_positions_and_rejection_when_full():
+    positions = []
+
+    async def run():
+        admission = AdmissionController(max_concurrent=1, max_queue=1)
+        release = asyncio.Event()
+
+        async def on_queued(position: int):
+            positions.append(position)
+
+        async def game():
+            async with admission.slot(on_queued):
+                await release.wait()
+
+        first = asyncio.create_task(game())
+        await asyncio.sleep(0)
+        second = asyncio.create_task(game())
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            async with admission.slot():
+                pass
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(run())
+    assert positions == [1]
+
+
+def test_cancelled_waiter_does_not_block_the_queue():
+    order = []
+
+    async def run():
+        admission = AdmissionController(max_concurrent=1, max_queue=5)
+        release = asyncio.Event()
+
+        async def game(name: str):
+            async with admission.slot():
+                order.append(name)
+                await release.wait()
+
+        first = asyncio.create_task(game("a"))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(game("b"))
+        third = asyncio.create_task(game("c"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        release.set()
+        await asyncio.gather(first, third)
+        assert admission.running == 0 and admission.queue_depth == 0
+
+    asyncio.run(run())
+    assert order == ["a", "c"]
+
+
+class StepPlayer:
+    """在线程中逐步产出步骤的最简玩家"""
+
+    def __init__(self, steps: int):
+        self.steps = steps
+        self.finished = threading.Event()
+
+    def run_auto_game(self, on_step):
+        history = GameHistory("25-3*6=7")
+        for _ in range(self.steps):
+            history.steps.append(GameStep("25-3*6=7", "22222222", 1, ""))
+            on_step(history, history.steps[-1])
+        self.finished.set()
+        return history
+
+
+def test_stream_releases_slot_when_game_ends():
+    async def run():
+        admission = AdmissionController(max_concurrent=1, max_queue=5)
+        player = StepPlayer(3)
+        stream = GameStream(player, admission.slot())
+        running_after_game = []
+        async for _, index in stream:
+            if index == 0:
+                # 模拟较慢的消息发送：游戏已结束但步骤还没发完
+                await asyncio.to_thread(player.finished.wait)
+                await asyncio.sleep(0.01)
+                running_after_game.append(admission.running)
+        assert running_after_game == [0]
+        assert stream.waited is not None
+        assert len(stream.result.steps) == 3
+
+    asyncio.run(run())
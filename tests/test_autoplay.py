@@ -0,0 +1,91 @@
+import time
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from nonebot_plugin_nerdle_autoplay.data_source import NerdleAutoPlayer
+from nonebot_plugin_nerdle_autoplay.solver import UNKNOWN_CODE
+
+
+class FakeDriver:
+    """不做任何事的浏览器驱动"""
+
+    def __init__(self):
+        self.visited = []
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def execute_script(self, script, *args):
+        return None
+
+    def quit(self):
+        pass
+
+
+def unreadable_player(variant: str, mode: str) -> NerdleAutoPlayer:
+    """每一行反馈都读取失败的玩家"""
+    player = NerdleAutoPlayer(variant, mode=mode)
+    driver = FakeDriver()
+
+    def setup_driver():
+        player.driver = driver
+        return True
+
+    player.setup_driver = setup_driver
+    player.wait_for_board = lambda *args, **kwargs: True
+    player.optimize_page_loading = lambda: None
+    player.type_guess = lambda guess: True
+    player.read_verified_feedback = lambda attempt, guess, candidates: None
+    return player
+
+
+@pytest.mark.parametrize("mode", ["hard", "hybrid", "free"])
+def test_unreadable_rows_do_not_stall_the_solver(mode):
+    start = time.perf_counter()
+    history = unreadable_player("classic", mode).run_auto_game()
+    elapsed = time.perf_counter() - start
+
+    # 候选未被收窄（约 2 万个），仍须在合理时间内选出每一次猜测
+    assert elapsed < 30
+    assert len(history.steps) == 6
+    assert all(step.pattern == UNKNOWN_CODE * 8 for step in history.steps)
+    assert not history.solved
+    assert len({step.guess for step in history.steps}) == 6
+
+
+@pytest.mark.parametrize("variant", ["mini", "midi"])
+@pytest.mark.parametrize("mode", ["hard", "hybrid", "free"])
+def test_unreadable_rows_are_not_guessed_again(variant, mode):
+    history = unreadable_player(variant, mode).run_auto_game()
+    guesses = [step.guess for step in history.steps]
+    assert len(guesses) == 6
+    assert len(set(guesses)) == 6
+
+
+class BrokenSnapshot:
+    """恢复时抛出异常的会话快照"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def restore(self, driver, url):
+        driver.get(url.rsplit("/", 1)[0] + "/robots.txt")
+        raise self.error
+
+    def capture(self, driver):
+        pass
+
+
+@pytest.mark.parametrize("error", [TimeoutException("robots.txt"), RuntimeError("storage")])
+def test_failed_snapshot_restore_still_opens_the_game(error):
+    player = unreadable_player("mini", "hard")
+    player.snapshot = BrokenSnapshot(error)
+    history = player.run_auto_game()
+
+    assert history
+    assert len(history.steps) == 6
+    assert player.driver.visited[-1].startswith(player.variant.url)
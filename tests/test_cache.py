@@ -0,0 +1,70 @@
+from nonebot_plugin_nerdle_autoplay.cache import LRUCache, cache_id
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    assert cache.get("a") is None
+    assert list(cache.data) == ["b", "c"]
+
+
+def test_get_refreshes_recency():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_put_existing_key_refreshes_recency():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+    assert list(cache.data) == ["a", "c"]
+    assert cache.get("a") == 10
+
+
+def test_zero_size_stores_nothing():
+    cache = LRUCache(0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_discard_if_removes_one_users_entries():
+    cache = LRUCache(8)
+    for user in ("alice", "bob"):
+        for variant in ("classic", "mini"):
+            cache.put(cache_id(user, variant), variant)
+    cache.discard_if(lambda key: key.startswith("alice"))
+    assert sorted(cache.data) == sorted([cache_id("bob", "classic"), cache_id("bob", "mini")])
+
+
+def test_final_images_are_keyed_by_steps():
+    from nonebot_plugin_nerdle_autoplay.cache import image_cache, render_final_png
+    from nonebot_plugin_nerdle_autoplay.data_source import GameHistory, GameStep
+
+    image_cache.clear()
+    cached_time = "2024-03-01 09:00"
+    hard = GameHistory(
+        answer="25-3*6=7",
+        steps=[GameStep("37-5*6=7", "10212222", 1, ""), GameStep("25-3*6=7", "22222222", 1, "")],
+        cached_time=cached_time,
+    )
+    free = GameHistory(
+        answer="25-3*6=7",
+        steps=[GameStep("1+56/7=9", "00110120", 9, ""), GameStep("25-3*6=7", "22222222", 1, "")],
+        cached_time=cached_time,
+    )
+    # 同一分钟解出同一题、步骤不同的两局不能共用图片
+    assert render_final_png(hard) != render_final_png(free)
+    assert len(image_cache) == 2
+    assert render_final_png(hard) == hard.render_final_image().getvalue()
+    image_cache.clear()
@@ -0,0 +1,67 @@
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+
+from nonebot_plugin_nerdle_autoplay.clock import FALLBACK_TZ, PuzzleClock
+
+TZ = timezone(timedelta(hours=8))
+
+# 包的 clock 属性是 cache.py 中的 PuzzleClock 实例，模块需从 sys.modules 取得
+clock_module = sys.modules["nonebot_plugin_nerdle_autoplay.clock"]
+
+
+@pytest.fixture
+def clock():
+    return PuzzleClock("Asia/Shanghai", time(8, 0), date(2022, 1, 20), guard_minutes=5)
+
+
+def at(hour: int, minute: int, second: int = 0, day: int = 1) -> datetime:
+    return datetime(2024, 3, day, hour, minute, second, tzinfo=TZ)
+
+
+def test_rollover_boundary(clock):
+    assert clock.puzzle_date(at(7, 59, 59)) == date(2024, 2, 29)
+    assert clock.puzzle_date(at(8, 0)) == date(2024, 3, 1)
+    assert clock.puzzle_number(at(8, 0)) - clock.puzzle_number(at(7, 59, 59)) == 1
+
+
+def test_epoch_is_puzzle_one(clock):
+    assert clock.puzzle_number(datetime(2022, 1, 20, 8, 0, tzinfo=TZ)) == 1
+    assert clock.puzzle_number(datetime(2022, 1, 21, 7, 59, tzinfo=TZ)) == 1
+
+
+def test_moments_in_other_zones_are_converted(clock):
+    # UTC 00:00 即北京时间 08:00
+    assert clock.puzzle_date(datetime(2024, 3, 1, 0, 0, tzinfo=timezone.utc)) == date(2024, 3, 1)
+    assert clock.puzzle_date(datetime(2024, 2, 29, 23, 59, tzinfo=timezone.utc)) == date(2024, 2, 29)
+
+
+def test_next_rollover(clock):
+    assert clock.next_rollover(at(7, 0)) == at(8, 0)
+    assert clock.next_rollover(at(8, 0)) == at(8, 0, day=2)
+
+
+@pytest.mark.parametrize(
+    "moment, inside",
+    [
+        (at(7, 54, 59), False),
+        (at(7, 55), True),
+        (at(8, 0), True),
+        (at(8, 5), True),
+        (at(8, 5, 1), False),
+        (at(12, 0), False),
+    ],
+)
+def test_guard_window_boundaries(clock, moment, inside):
+    assert clock.in_guard_window(moment) is inside
+
+
+def test_missing_timezone_falls_back_to_utc8(monkeypatch):
+    def missing(name):
+        raise clock_module.ZoneInfoNotFoundError(name)
+
+    monkeypatch.setattr(clock_module, "ZoneInfo", missing)
+    fallback = PuzzleClock("Asia/Shanghai")
+    assert fallback.tz is FALLBACK_TZ
+    assert fallback.puzzle_date(datetime(2024, 3, 1, 0, 0, tzinfo=timezone.utc)) == date(2024, 3, 1)
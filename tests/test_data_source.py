@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from nonebot_plugin_nerdle_autoplay.data_source import (
+    BLOCK_PADDING,
+    BLOCK_SIZE,
+    HISTORY_FORMAT_VERSION,
+    PADDING,
+    GameHistory,
+    GameStep,
+    NerdleAutoPlayer,
+)
+from nonebot_plugin_nerdle_autoplay.solver import UNKNOWN_CODE
+
+
+def test_players_share_one_dictionary_per_length():
+    first = NerdleAutoPlayer("mini")
+    second = NerdleAutoPlayer("mini", mode="hard")
+    assert first.index is second.index
+    assert first.all_candidates is second.all_candidates
+    assert first.tree is second.tree
+    assert first.tree is not None
+    assert NerdleAutoPlayer("midi").index is not first.index
+
+
+def v1_history() -> dict:
+    """旧版（v1）缓存：逐字符反馈、没有版本号"""
+    steps = [
+        ("1+56/7=9", "00110120", 12, "37-5*6=7"),
+        ("37-5*6=7", "10212222", 1, "25-3*6=7"),
+        ("25-3*6=7", "22222222", 1, ""),
+    ]
+    status = {"0": "absent", "1": "present", "2": "correct"}
+    return {
+        "answer": "25-3*6=7",
+        "steps": [
+            {
+                "guess": guess,
+                "feedback": [{"char": c, "status": status[code]} for c, code in zip(guess, pattern)],
+                "candidate_count": count,
+                "next_suggestion": suggestion,
+            }
+            for guess, pattern, count, suggestion in steps
+        ],
+        "date": "2024-03-01",
+        "cached_time": "2024-03-01 09:00",
+    }
+
+
+def test_v1_history_round_trips_through_v2():
+    data = v1_history()
+    history = GameHistory.from_dict(data)
+    assert [step.pattern for step in history.steps] == ["00110120", "10212222", "22222222"]
+    for step, old in zip(history.steps, data["steps"]):
+        assert step.feedback == old["feedback"]
+
+    compact = history.to_dict()
+    assert compact["v"] == HISTORY_FORMAT_VERSION == 2
+    assert compact["steps"][0] == ["1+56/7=9", "00110120", 12, "37-5*6=7"]
+
+    restored = GameHistory.from_dict(json.loads(history.dumps()))
+    assert restored == history
+    assert restored.cached_time == "2024-03-01 09:00"
+
+
+def test_newer_format_is_rejected():
+    data = GameHistory("25-3*6=7").to_dict()
+    data["v"] = HISTORY_FORMAT_VERSION + 1
+    with pytest.raises(ValueError):
+        GameHistory.from_dict(data)
+
+
+def test_unread_feedback_step_is_kept_and_rendered():
+    history = GameHistory(
+        answer="",
+        steps=[
+            GameStep("1+56/7=9", UNKNOWN_CODE * 8, 20, ""),
+            GameStep("37-5*6=7", "10212222", 1, "25-3*6=7"),
+        ],
+    )
+    assert {fb["status"] for fb in history.steps[0].feedback} == {"unknown"}
+    # 未读取反馈的字符不影响键盘区的状态
+    assert history.get_char_status_at_step(0)["1"] == "unguessed"
+    assert history.get_char_status_at_step(1)["3"] == "exist"
+    assert history.render_step_image(1).getvalue().startswith(b"\x89PNG")
+
+    restored = GameHistory.from_dict(json.loads(history.dumps()))
+    assert restored.steps[0].pattern == UNKNOWN_CODE * 8
+
+
+@pytest.mark.parametrize("guess", ["4*3=12", "12+3=15", "1+56/7=9"])
+def test_board_always_has_six_rows(guess):
+    from PIL import Image
+
+    history = GameHistory(answer="", steps=[GameStep(guess, "0" * len(guess), 10, "")])
+    height = Image.open(history.render_step_image(0)).height
+    # 6 行方块 + 3 行键盘区，每个区域上下各有留白
+    rows = 6 + 3
+    assert height == rows * BLOCK_SIZE[1] + (rows - 2) * BLOCK_PADDING[1] + 4 * PADDING[1]
+
+
+def test_only_a_fully_correct_last_step_counts_as_solved():
+    solved = GameHistory.from_dict(v1_history())
+    assert solved.solved
+
+    # 未解出时 answer 为推测的候选，不算解出
+    guessed = GameHistory(answer="25-3*6=7", steps=solved.steps[:2])
+    assert not guessed.solved
+    unread = GameHistory(answer="25-3*6=7", steps=[GameStep("25-3*6=7", UNKNOWN_CODE * 8, 1, "")])
+    assert not unread.solved
+    assert not GameHistory(answer="未知").solved
@@ -0,0 +1,47 @@
+from nonebot_plugin_nerdle_autoplay.metrics import MetricsRegistry, registry
+
+
+def record_games(metrics: MetricsRegistry):
+    invocations = metrics.counter("nerdle_autoplay_invocations_total", "调用次数")
+    running = metrics.gauge("nerdle_games_running", "进行中的局数")
+    turns = metrics.histogram("nerdle_game_turns", "尝试次数", buckets=[1, 2, 3, 4, 5, 6])
+    for attempts in (3, 4, 3):
+        invocations.inc(variant="classic")
+        running.inc()
+        turns.observe(attempts)
+        running.dec()
+    invocations.inc(variant="mini")
+
+
+def test_render_after_recorded_games():
+    metrics = MetricsRegistry()
+    record_games(metrics)
+    lines = metrics.render().splitlines()
+
+    assert "# TYPE nerdle_autoplay_invocations_total counter" in lines
+    assert "# TYPE nerdle_games_running gauge" in lines
+    assert "# TYPE nerdle_game_turns histogram" in lines
+    assert 'nerdle_autoplay_invocations_total{variant="classic"} 3' in lines
+    assert 'nerdle_autoplay_invocations_total{variant="mini"} 1' in lines
+    assert "nerdle_games_running 0" in lines
+    # 直方图的桶是累积的
+    assert 'nerdle_game_turns_bucket{le="2"} 0' in lines
+    assert 'nerdle_game_turns_bucket{le="3"} 2' in lines
+    assert 'nerdle_game_turns_bucket{le="4"} 3' in lines
+    assert 'nerdle_game_turns_bucket{le="+Inf"} 3' in lines
+    assert "nerdle_game_turns_sum 10" in lines
+    assert "nerdle_game_turns_count 3" in lines
+
+
+def test_every_metric_is_exposed_with_headers():
+    text = registry.render()
+    assert text.endswith("\n")
+    for name, metric in registry.metrics.items():
+        assert f"# HELP {name} " in text
+        assert f"# TYPE {name} {metric.type_name}\n" in text
+
+
+def test_label_values_are_escaped():
+    metrics = MetricsRegistry()
+    metrics.counter("nerdle_test_total", "测试").inc(user='a"b\\c')
+    assert 'nerdle_test_total{user="a\\"b\\\\c"} 1' in metrics.render().splitlines()
@@ -0,0 +1,62 @@
+import asyncio
+
+from nonebot_plugin_nerdle_autoplay.pacing import TokenBucket
+
+
+class FakeClock:
+    """手动推进的时钟，等待时直接拨快"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_burst_is_served_without_waiting():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock, sleep=clock.sleep)
+
+    async def run():
+        for _ in range(3):
+            await bucket.acquire()
+
+    asyncio.run(run())
+    assert clock.sleeps == []
+    assert clock.now == 0
+
+
+def test_waits_for_refill_once_empty():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=1, clock=clock, sleep=clock.sleep)
+
+    async def run():
+        for _ in range(3):
+            await bucket.acquire()
+
+    asyncio.run(run())
+    # 桶空后每个令牌需要 1 / rate 秒
+    assert clock.sleeps == [0.5, 0.5]
+    assert clock.now == 1.0
+
+
+def test_idle_time_refills_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, capacity=2, clock=clock, sleep=clock.sleep)
+
+    async def run():
+        await bucket.acquire()
+        await bucket.acquire()
+        clock.now += 10
+        await bucket.acquire()
+        await bucket.acquire()
+        await bucket.acquire()
+
+    asyncio.run(run())
+    # 空闲 10 秒只补满 2 个令牌，第 3 个需要等待
+    assert clock.sleeps == [1.0]
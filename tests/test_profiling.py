@@ -0,0 +1,77 @@
+import contextvars
+import threading
+
+from nonebot_plugin_nerdle_autoplay.profiling import HotPathProfiler
+
+
+def make_profiled(profiler: HotPathProfiler):
+    @profiler.profiled
+    def inner(n: int) -> int:
+        return sum(range(n))
+
+    @profiler.profiled
+    def outer(n: int) -> int:
+        return inner(n) + 1
+
+    return outer
+
+
+def test_disabled_profiler_does_not_start_games():
+    profiler = HotPathProfiler(enabled=False)
+    assert profiler.start_game() is None
+
+
+def test_calls_are_recorded_in_the_game_context():
+    profiler = HotPathProfiler(enabled=True)
+    outer = make_profiled(profiler)
+
+    def game():
+        profile = profiler.start_game()
+        assert outer(10) == 46
+        return profile
+
+    profile = contextvars.copy_context().run(game)
+    names = {func[2] for func in profile.stats().stats}
+    assert {"outer", "inner"} <= names
+
+    # 其他上下文中的调用不被记录
+    assert outer(10) == 46
+
+
+def test_empty_profile_is_not_dumped():
+    profiler = HotPathProfiler(enabled=True)
+    profile = contextvars.copy_context().run(profiler.start_game)
+    assert profiler.dump(profile, "empty") is None
+
+
+def test_threads_of_one_game_are_recorded_separately():
+    profiler = HotPathProfiler(enabled=True)
+
+    @profiler.profiled
+    def work(n: int) -> int:
+        return sum(range(n))
+
+    def game():
+        profile = profiler.start_game()
+        start = threading.Barrier(2)
+
+        def run(func):
+            start.wait()
+            for _ in range(300):
+                func(100)
+
+        # 同一局游戏的两个线程同时调用被装饰的函数
+        threads = [
+            threading.Thread(target=contextvars.copy_context().run, args=(run, func))
+            for func in (work, make_profiled(profiler))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return profile
+
+    profile = contextvars.copy_context().run(game)
+    assert len(profile.profiles) == 2
+    calls = {func[2]: stat[1] for func, stat in profile.stats().stats.items()}
+    assert calls["work"] == calls["outer"] == calls["inner"] == 300
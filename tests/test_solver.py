@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from nonebot_plugin_nerdle_autoplay.solver import (
+    CandidateSet,
+    ConstraintIndex,
+    best_probe_guess,
+    filter_candidates_by_feedback,
+    load_dictionary,
+    nerdle_feedback,
+)
+
+
+@pytest.fixture(scope="module", params=[6, 7])
+def equations(request):
+    entries, _ = load_dictionary(request.param)
+    return entries
+
+
+def test_narrow_matches_list_filter(equations):
+    index = ConstraintIndex(equations)
+    rng = random.Random(0)
+    for _ in range(50):
+        answer, guess = rng.sample(equations, 2)
+        feedback = nerdle_feedback(answer, guess)
+        expected = filter_candidates_by_feedback(equations, guess, feedback)
+        assert index.to_list(index.narrow(index.full, guess, feedback)) == expected
+        assert answer in expected
+
+
+def test_narrow_chains_like_repeated_filtering(equations):
+    index = ConstraintIndex(equations)
+    rng = random.Random(1)
+    answer = rng.choice(equations)
+    mask, candidates = index.full, list(equations)
+    for guess in rng.sample(equations, 3):
+        feedback = nerdle_feedback(answer, guess)
+        mask = index.narrow(mask, guess, feedback)
+        candidates = filter_candidates_by_feedback(candidates, guess, feedback)
+        assert index.to_list(mask) == candidates
+
+
+def test_narrow_rejects_unknown_status(equations):
+    index = ConstraintIndex(equations)
+    guess = equations[0]
+    feedback = [{"char": char, "status": "correct"} for char in guess]
+    feedback[0]["status"] = ""
+    assert index.narrow(index.full, guess, feedback) == 0
+
+
+def test_candidate_set_narrows_like_list_filter(equations):
+    candidates = CandidateSet(ConstraintIndex(equations))
+    assert len(candidates) == len(equations)
+    assert candidates.to_list() == equations
+    assert candidates.first() == equations[0]
+
+    rng = random.Random(2)
+    answer, guess = rng.sample(equations, 2)
+    feedback = nerdle_feedback(answer, guess)
+    narrowed = candidates.narrow(guess, feedback)
+    expected = filter_candidates_by_feedback(equations, guess, feedback)
+    assert narrowed.to_list() == list(narrowed) == expected
+    assert len(narrowed) == len(expected)
+    assert narrowed.first() == expected[0]
+    assert answer in narrowed
+    assert guess not in narrowed
+    # 收窄返回新的集合，原集合不变
+    assert len(candidates) == len(equations)
+
+
+def test_candidate_set_discard(equations):
+    candidates = CandidateSet(ConstraintIndex(equations))
+    rest = candidates.discard(equations[0])
+    assert equations[0] in candidates
+    assert equations[0] not in rest
+    assert len(rest) == len(equations) - 1
+    assert rest.first() == equations[1]
+    # 不在词典中的等式不影响集合
+    assert len(rest.discard("not-an-equation")) == len(rest)
+    assert "not-an-equation" not in rest
+
+
+def test_empty_candidate_set(equations):
+    index = ConstraintIndex(equations)
+    empty = CandidateSet(index, 0)
+    assert not empty
+    assert len(empty) == 0
+    assert empty.first() is None
+    assert empty.to_list() == []
+    assert empty.sample(3) == []
+    assert CandidateSet(index, index.bit(equations[-1])).discard(equations[-1]).first() is None
+
+
+def test_candidate_set_sample(equations):
+    candidates = CandidateSet(ConstraintIndex(equations))
+    sample = candidates.sample(5, random.Random(3))
+    assert len(sample) == len(set(sample)) == 5
+    assert all(equation in candidates for equation in sample)
+    assert sample == candidates.sample(5, random.Random(3))
+
+    index = candidates.index
+    small = CandidateSet(index, index.bit(equations[0]) | index.bit(equations[1]))
+    assert small.sample(5) == equations[:2]
+
+
+def test_best_probe_guess_skips_played_guesses(equations):
+    candidates = CandidateSet(ConstraintIndex(equations))
+    played = []
+    for _ in range(6):
+        guess = best_probe_guess(candidates, played=played)
+        assert guess and guess not in played
+        played.append(guess)
+    # 不传入已猜过的等式时结果不变
+    assert best_probe_guess(candidates) == played[0]
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from nonebot_plugin_nerdle_autoplay.timing import TimingStats, format_timing_record, percentile, record_span
+
+
+@pytest.mark.parametrize(
+    ("values", "pct", "expected"),
+    [
+        ([1, 2], 50, 1),
+        (list(range(1, 7)), 50, 3),
+        (list(range(1, 11)), 50, 5),
+        (list(range(1, 11)), 95, 10),
+        (list(range(1, 101)), 95, 95),
+        ([3, 1, 2], 0, 1),
+        ([3, 1, 2], 100, 3),
+        ([7], 50, 7),
+        ([], 50, 0.0),
+    ],
+)
+def test_percentile_is_nearest_rank(values, pct, expected):
+    assert percentile(values, pct) == expected
+
+
+def test_timing_stats_summary():
+    stats = TimingStats(maxlen=4)
+    for seconds in (0.5, 0.1, 0.4, 0.2, 0.3):
+        stats.add("suggest", seconds)
+    stats.add("input", 1.0)
+
+    # 只保留最近 maxlen 个样本，按阶段名排序
+    assert stats.summary() == [("input", 1, 1.0, 1.0), ("suggest", 4, 0.2, 0.4)]
+
+    stats.clear()
+    assert stats.summary() == []
+
+
+def test_format_timing_record_is_one_json_line():
+    line = format_timing_record("turn", "反馈", 0.25, turn=2)
+    assert "\n" not in line and " " not in line
+    assert json.loads(line) == {"scope": "turn", "phase": "反馈", "seconds": 0.25, "turn": 2}
+
+
+def test_record_span_accumulates():
+    timings = {}
+    with record_span(timings, "filter"):
+        pass
+    first = timings["filter"]
+    with record_span(timings, "filter"):
+        pass
+    assert timings["filter"] >= first
+    assert set(timings) == {"filter"}